@@ -0,0 +1,100 @@
+# benchmarks/curl_overhead.py
+"""
+Micro-benchmark do custo por requisição da geração do cURL de reprodução.
+
+Executa o HTTPClient.send_request real contra uma sessão stub (sem rede),
+medindo o trabalho do cliente por requisição no caminho de sucesso, onde
+o cURL não é gerado, e no caminho de erro (HTTP 500), onde o cURL é
+montado e enviado ao ErrorSink. A diferença é o custo que toda requisição
+pagaria se o cURL fosse gerado antes do envio.
+
+Uso:
+    python -m benchmarks.curl_overhead [--rows N] [--columns N]
+"""
+import argparse
+import asyncio
+import time
+
+from clients.http_client import HTTPClient
+
+
+def _build_row(columns):
+    return {f"coluna_{i}": f"valor_{i}_abcdefghij" for i in range(columns)}
+
+
+class _StubResponse:
+    """Resposta fixa, com a mesma interface usada por send_request."""
+
+    def __init__(self, status):
+        self.status = status
+        self.reason = "OK" if status < 400 else "Internal Server Error"
+        self.headers = {}
+        self._raw = b'{"id": 1}'
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def read(self):
+        return self._raw
+
+    async def text(self):
+        return self._raw.decode()
+
+
+class _StubSession:
+    """Sessão aiohttp de mentira: responde sempre com o mesmo status."""
+
+    closed = False
+
+    def __init__(self, status):
+        self.status = status
+
+    def post(self, url, data=None, headers=None):
+        return _StubResponse(self.status)
+
+    def get(self, url, params=None, headers=None):
+        return _StubResponse(self.status)
+
+    async def close(self):
+        pass
+
+
+class _NullSink:
+    """ErrorSink que descarta os registros (mede só a montagem, não a escrita)."""
+
+    def emit(self, record):
+        pass
+
+
+async def _run(status, rows, row, url, token):
+    client = HTTPClient(error_sink=_NullSink())
+    client._session = _StubSession(status)
+    started = time.perf_counter()
+    for _ in range(rows):
+        await client.send_request("post", url, data=row, token=token)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--columns", type=int, default=20)
+    args = parser.parse_args()
+
+    row = _build_row(args.columns)
+    url = "https://api.example.com/v1/items"
+    token = "x" * 64
+
+    timings = {}
+    for name, status in (("sucesso (200)", 200), ("erro (500)", 500)):
+        elapsed = asyncio.run(_run(status, args.rows, row, url, token))
+        timings[name] = elapsed / args.rows * 1e6
+        print(f"{name:>14}: {timings[name]:8.3f} µs/requisição")
+    print(f"{'cURL':>14}: {timings['erro (500)'] - timings['sucesso (200)']:8.3f} µs/requisição com erro")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# benchmarks/generate_csv.py
+"""
+Gera CSVs sintéticos para os benchmarks.
+
+Uso:
+    python -m benchmarks.generate_csv saida.csv --rows 100000 --columns 20
+"""
+import argparse
+import csv
+import random
+import string
+
+
+def generate_csv(path, rows, columns=10, delimiter=";", value_length=12, seed=42):
+    """
+    Escreve um CSV com `rows` linhas e `columns` colunas: uma coluna 'id'
+    sequencial e as demais alternando inteiros, decimais e textos.
+    """
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits
+    header = ["id"] + [f"col_{i}" for i in range(1, columns)]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        writer.writerow(header)
+        for row_id in range(1, rows + 1):
+            row = [row_id]
+            for i in range(1, columns):
+                kind = i % 3
+                if kind == 0:
+                    row.append(rng.randint(0, 1_000_000))
+                elif kind == 1:
+                    row.append(f"{rng.uniform(0, 1000):.2f}")
+                else:
+                    row.append("".join(rng.choices(alphabet, k=value_length)))
+            writer.writerow(row)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("path")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--columns", type=int, default=10)
+    parser.add_argument("--delimiter", default=";")
+    args = parser.parse_args()
+    generate_csv(args.path, args.rows, args.columns, args.delimiter)
+
+
+if __name__ == "__main__":
+    main()
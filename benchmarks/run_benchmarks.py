@@ -0,0 +1,243 @@
+# benchmarks/run_benchmarks.py
+"""
+Suíte de benchmarks reprodutível do pipeline de envio.
+
+Sobe o servidor stub local, gera CSVs sintéticos e executa o UploaderService
+para cada combinação de tamanho de arquivo × concorrência, cada uma em um
+processo próprio. Registra linhas/s, latência p50/p99, pico de RSS e tempo
+de CPU em um JSON que pode ser comparado com execuções anteriores.
+
+Uso:
+    python -m benchmarks.run_benchmarks --rows 10000,100000 --concurrency 10,50,200
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/base.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.generate_csv import generate_csv
+from benchmarks.stub_server import serve
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for_port(port, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Servidor stub não respondeu na porta {port}")
+
+
+def _run_case(case, overrides, results):
+    """Executa um envio completo no processo atual e mede seus recursos."""
+    from config import Settings
+    for name, value in overrides.items():
+        setattr(Settings, name, value)
+
+    from services.uploader_service import UploaderService
+    from services.auth_service import AuthService
+
+    auth_service = None
+    if case["auth_url"]:
+        auth_service = AuthService(case["auth_url"], "bench", "bench", logger=lambda message: None)
+
+    uploader = UploaderService(
+        file_path=case["csv"],
+        auth_token=None,
+        endpoint_url=case["url"],
+        concurrency=case["concurrency"],
+        logger=None,
+        auth_service=auth_service,
+    )
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    uploader.start_upload()
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+
+    snapshot = uploader.metrics.last_snapshot or uploader.metrics.snapshot()
+    done = uploader.ok_count + uploader.error_count
+    results.put({
+        "rows": case["rows"],
+        "columns": case["columns"],
+        "concurrency": case["concurrency"],
+        "elapsed": elapsed,
+        "rows_per_second": done / elapsed if elapsed > 0 else 0.0,
+        "ok": uploader.ok_count,
+        "errors": uploader.error_count,
+        "retries": uploader.retry_count,
+        "latency_p50": snapshot["latency"]["p50"],
+        "latency_p99": snapshot["latency"]["p99"],
+        # ru_maxrss é em KB no Linux e em bytes no macOS
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024),
+        "cpu_seconds": cpu,
+    })
+
+
+def _wait_result(results, process):
+    """Aguarda o resultado de um caso, falhando se o processo morrer antes."""
+    while True:
+        try:
+            return results.get(timeout=1.0)
+        except queue.Empty:
+            if not process.is_alive():
+                raise RuntimeError(f"O caso de benchmark terminou sem resultado (código {process.exitcode})")
+
+
+def _parse_list(value, cast=int):
+    return [cast(v) for v in value.split(",") if v.strip()]
+
+
+def _parse_overrides(items):
+    overrides = {}
+    for item in items:
+        name, _, value = item.partition("=")
+        try:
+            overrides[name.strip()] = json.loads(value)
+        except ValueError:
+            overrides[name.strip()] = value
+    return overrides
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _case_key(result):
+    return result["rows"], result["columns"], result["concurrency"]
+
+
+def compare(current, baseline_path, threshold):
+    """
+    Compara linhas/s e p99 com um resultado anterior. Retorna True se
+    alguma combinação ficou mais lenta que `threshold` (fração).
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {_case_key(r): r for r in json.load(f)["results"]}
+
+    regressed = False
+    print(f"\nComparação com {baseline_path} (limite {threshold:.0%}):")
+    for result in current["results"]:
+        base = baseline.get(_case_key(result))
+        if base is None:
+            continue
+        throughput = result["rows_per_second"] / base["rows_per_second"] - 1 if base["rows_per_second"] else 0.0
+        p99 = result["latency_p99"] / base["latency_p99"] - 1 if base["latency_p99"] else 0.0
+        flag = ""
+        if throughput < -threshold:
+            flag, regressed = "  ⚠️ REGRESSÃO", True
+        print(f"  rows={result['rows']:>9} conc={result['concurrency']:>4}: "
+              f"linhas/s {throughput:+.1%}, p99 {p99:+.1%}{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", default="10000,100000", help="Tamanhos de arquivo (linhas), separados por vírgula")
+    parser.add_argument("--concurrency", default="10,50,200", help="Concorrências, separadas por vírgula")
+    parser.add_argument("--columns", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.005, help="Latência do servidor stub (s)")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--auth", action="store_true", help="Autentica no /token do servidor stub")
+    parser.add_argument("--set", action="append", default=[], metavar="NOME=VALOR",
+                        help="Sobrescreve um atributo de Settings nas execuções (ex.: BATCH_SIZE=100)")
+    parser.add_argument("--output", help="Arquivo JSON de saída (padrão: benchmarks/results/<data>.json)")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Queda de linhas/s considerada regressão")
+    args = parser.parse_args()
+
+    overrides = {"RETRY_BASE_DELAY": 0.05, "ERROR_LOG_DIR": tempfile.gettempdir()}
+    overrides.update(_parse_overrides(args.set))
+
+    context = multiprocessing.get_context("spawn")
+    port = _free_port()
+    server = context.Process(
+        target=serve,
+        args=(port,),
+        kwargs={
+            "latency": args.latency, "jitter": args.jitter,
+            "error_rate": args.error_rate, "throttle_rate": args.throttle_rate,
+        },
+        daemon=True,
+    )
+    server.start()
+    results_queue = context.Queue()
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "server": {
+                "latency": args.latency, "jitter": args.jitter,
+                "error_rate": args.error_rate, "throttle_rate": args.throttle_rate,
+            },
+            "settings": overrides,
+        },
+        "results": [],
+    }
+
+    try:
+        _wait_for_port(port)
+        with tempfile.TemporaryDirectory() as tmp:
+            for rows in _parse_list(args.rows):
+                csv_path = generate_csv(os.path.join(tmp, f"bench_{rows}.csv"), rows, args.columns)
+                for concurrency in _parse_list(args.concurrency):
+                    case = {
+                        "csv": csv_path,
+                        "rows": rows,
+                        "columns": args.columns,
+                        "concurrency": concurrency,
+                        "url": f"http://127.0.0.1:{port}/ingest",
+                        "auth_url": f"http://127.0.0.1:{port}/token" if args.auth else None,
+                    }
+                    process = context.Process(target=_run_case, args=(case, overrides, results_queue))
+                    process.start()
+                    result = _wait_result(results_queue, process)
+                    process.join()
+                    report["results"].append(result)
+                    print(f"rows={rows:>9} conc={concurrency:>4}: {result['rows_per_second']:>9.0f} linhas/s | "
+                          f"p50 {result['latency_p50'] * 1000:6.1f}ms | p99 {result['latency_p99'] * 1000:6.1f}ms | "
+                          f"RSS {result['peak_rss_mb']:6.1f}MB | CPU {result['cpu_seconds']:6.2f}s")
+    finally:
+        server.terminate()
+        server.join()
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResultados salvos em {output}")
+
+    if args.compare and compare(report, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# benchmarks/stub_server.py
+"""
+Servidor HTTP local (aiohttp) que simula a API de destino nos benchmarks.
+
+Rotas:
+    POST/GET /ingest  recebe as linhas; latência, erros 500 e 429 configuráveis
+    POST     /token   devolve {"access_token": ..., "expires_in": ...}
+
+Uso:
+    python -m benchmarks.stub_server --port 8080 --latency 0.02 --error-rate 0.01
+"""
+import argparse
+import asyncio
+import random
+import uuid
+
+from aiohttp import web
+
+
+def build_app(latency=0.0, jitter=0.0, error_rate=0.0, throttle_rate=0.0, retry_after=1, token_ttl=3600):
+    """
+    :param latency: Latência média de cada resposta (segundos)
+    :param jitter: Variação máxima (±) aplicada à latência
+    :param error_rate: Fração de respostas 500
+    :param throttle_rate: Fração de respostas 429 (com Retry-After)
+    :param retry_after: Valor do header Retry-After nas respostas 429
+    :param token_ttl: expires_in devolvido por /token
+    """
+    stats = {"requests": 0, "rows": 0, "errors": 0, "throttled": 0, "tokens": 0}
+
+    async def ingest(request):
+        stats["requests"] += 1
+        body = await request.read()
+        delay = latency + random.uniform(-jitter, jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        draw = random.random()
+        if draw < throttle_rate:
+            stats["throttled"] += 1
+            return web.json_response({"error": "throttled"}, status=429, headers={"Retry-After": str(retry_after)})
+        if draw < throttle_rate + error_rate:
+            stats["errors"] += 1
+            return web.json_response({"error": "internal"}, status=500)
+
+        stats["rows"] += max(1, body.count(b"\n")) if request.content_type == "application/x-ndjson" else 1
+        return web.json_response({"id": uuid.uuid4().hex}, status=201)
+
+    async def token(request):
+        stats["tokens"] += 1
+        return web.json_response({"access_token": uuid.uuid4().hex, "expires_in": token_ttl})
+
+    async def get_stats(request):
+        return web.json_response(stats)
+
+    app = web.Application(client_max_size=64 * 1024 * 1024)
+    app.router.add_route("*", "/ingest", ingest)
+    app.router.add_post("/token", token)
+    app.router.add_get("/stats", get_stats)
+    return app
+
+
+def serve(port, **options):
+    """Roda o servidor até o processo ser encerrado (alvo de multiprocessing)."""
+    web.run_app(build_app(**options), host="127.0.0.1", port=port, print=None, access_log=None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--token-ttl", type=int, default=3600)
+    args = parser.parse_args()
+    serve(
+        args.port, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate, retry_after=args.retry_after, token_ttl=args.token_ttl,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+# cli/__init__.py
+
+from .cli import run
+
+__all__ = ["run"]
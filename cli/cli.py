@@ -0,0 +1,299 @@
+# cli/cli.py
+import argparse
+import json
+import os
+import sys
+import time
+
+from config import Settings
+from services.uploader_service import UploaderService
+from services.auth_service import AuthService
+from services.sharded_uploader import ShardedUploader
+
+# Códigos de saída
+EXIT_OK = 0
+EXIT_ROW_ERRORS = 1
+EXIT_USAGE = 2
+EXIT_AUTH = 3
+EXIT_INCOMPLETE = 4         # Envio não concluído (ex.: falha de um processo/shard)
+EXIT_INTERRUPTED = 130
+
+# Prefixo das variáveis de ambiente que sobrescrevem Settings (ex.: CSV_POSTER_CONCURRENCY=50)
+ENV_PREFIX = "CSV_POSTER_"
+
+# Flag da linha de comando → atributo de Settings
+FLAG_SETTINGS = {
+    "url": "ENDPOINT_URL",
+    "endpoint": "ENDPOINTS",
+    "method": "METHOD",
+    "delimiter": "DELIMITER",
+    "schema": "CSV_SCHEMA",
+    "template": "PAYLOAD_TEMPLATE",
+    "concurrency": "CONCURRENCY",
+    "adaptive": "ADAPTIVE_CONCURRENCY",
+    "max_concurrency": "ADAPTIVE_MAX_CONCURRENCY",
+    "rate_limit": "RATE_LIMIT",
+    "rate_burst": "RATE_LIMIT_BURST",
+    "rate_limit_headers": "RATE_LIMIT_FROM_HEADERS",
+    "timeout": "HTTP_TIMEOUT",
+    "retries": "RETRY_MAX_ATTEMPTS",
+    "checkpoint": "CHECKPOINT_ENABLED",
+    "batch_size": "BATCH_SIZE",
+    "batch_format": "BATCH_FORMAT",
+    "batch_max_bytes": "BATCH_MAX_BYTES",
+    "batch_linger": "BATCH_LINGER",
+    "dedup": "DEDUP_MODE",
+    "dedup_keys": "DEDUP_KEY_COLUMNS",
+    "idempotency_key": "IDEMPOTENCY_KEY",
+    "order_keys": "ORDER_KEY_COLUMNS",
+    "circuit_breaker": "CIRCUIT_BREAKER_ENABLED",
+    "auth_url": "AUTH_URL",
+    "client_id": "CLIENT_ID",
+    "client_secret": "CLIENT_SECRET",
+    "token_path": "TOKEN_JSON_PATH",
+    "progress_interval": "LOG_SUMMARY_INTERVAL",
+    "processes": "PROCESSES",
+    "results": "RESULTS_FILE",
+    "failed_rows": "FAILED_ROWS_FILE",
+    "metrics_json": "METRICS_JSON_FILE",
+    "metrics_prometheus": "METRICS_PROMETHEUS_FILE",
+    "metrics_interval": "METRICS_INTERVAL",
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="csv_poster",
+        description="Envia as linhas de um CSV para uma API, sem interface gráfica.",
+        epilog=(
+            "Qualquer atributo de Settings pode vir de um arquivo JSON (--config), "
+            f"de variáveis de ambiente {ENV_PREFIX}<NOME> ou de --set NOME=VALOR, "
+            "nessa ordem de precedência; as flags acima têm a maior precedência."
+        ),
+    )
+    parser.add_argument("csv_file", help="Arquivo CSV a enviar")
+    parser.add_argument("--url", help="Endpoint que recebe as linhas")
+    parser.add_argument("--endpoint", action="append", metavar="URL",
+                        help="Endpoint equivalente para balanceamento (repetível; pesos via ENDPOINTS)")
+    parser.add_argument("--method", choices=["POST", "GET"], type=str.upper)
+    parser.add_argument("--delimiter", help="Delimitador do CSV")
+    parser.add_argument("--schema", type=json.loads, metavar="JSON",
+                        help='Tipos das colunas, ex.: \'{"idade": "int", "obs": "skip"}\'')
+    parser.add_argument("--template", type=_load_json_arg, metavar="JSON|ARQUIVO",
+                        help='Template do corpo, ex.: \'{"cliente": {"id": "{id}"}}\' ou um arquivo .json')
+    parser.add_argument("--config", help="Arquivo JSON com atributos de Settings")
+    parser.add_argument("--set", action="append", default=[], metavar="NOME=VALOR",
+                        help="Sobrescreve um atributo de Settings (pode repetir)")
+
+    perf = parser.add_argument_group("desempenho")
+    perf.add_argument("--concurrency", type=int, help="Concorrência total (dividida entre os processos)")
+    perf.add_argument("--processes", type=int, help="Processos de envio, cada um com uma faixa do CSV")
+    perf.add_argument("--adaptive", action="store_true", default=None, help="Concorrência adaptativa (AIMD)")
+    perf.add_argument("--max-concurrency", type=int, help="Teto da concorrência adaptativa")
+    perf.add_argument("--rate-limit", type=float, help="Requisições por segundo (0 = sem limite)")
+    perf.add_argument("--rate-burst", type=float)
+    perf.add_argument("--rate-limit-headers", action="store_true", default=None,
+                      help="Respeita X-RateLimit-Remaining/Reset")
+    perf.add_argument("--timeout", type=float, help="Timeout de cada requisição (s)")
+    perf.add_argument("--retries", type=int, help="Tentativas por linha, incluindo a primeira")
+    perf.add_argument("--checkpoint", action="store_true", default=None, help="Salva progresso e retoma envios")
+    perf.add_argument("--batch-size", type=int, help="Linhas por requisição (1 = sem lote)")
+    perf.add_argument("--batch-format", choices=["array", "ndjson", "wrapper"])
+    perf.add_argument("--batch-max-bytes", type=int)
+    perf.add_argument("--batch-linger", type=float)
+    perf.add_argument("--dedup", choices=["off", "exact", "bloom"], help="Descarta linhas repetidas no envio")
+    perf.add_argument("--dedup-keys", type=lambda v: tuple(c.strip() for c in v.split(",") if c.strip()),
+                      metavar="COL1,COL2", help="Colunas que identificam a linha (padrão: linha inteira)")
+    perf.add_argument("--circuit-breaker", action="store_true", default=None,
+                      help="Pausa o envio enquanto o endpoint parece fora do ar")
+    perf.add_argument("--order-keys", type=lambda v: tuple(c.strip() for c in v.split(",") if c.strip()),
+                      metavar="COL1,COL2", help="Entrega em ordem as linhas de uma mesma chave")
+    perf.add_argument("--idempotency-key", action="store_true", default=None,
+                      help="Envia um Idempotency-Key derivado do hash da linha")
+
+    auth = parser.add_argument_group("autenticação")
+    auth.add_argument("--token", help="Bearer token fixo (sem AuthService)")
+    auth.add_argument("--auth-url")
+    auth.add_argument("--client-id")
+    auth.add_argument("--client-secret", help=f"Prefira {ENV_PREFIX}CLIENT_SECRET para não expor o segredo")
+    auth.add_argument("--token-path", help="JSONPath do token na resposta de autenticação")
+
+    output = parser.add_argument_group("saída")
+    output.add_argument("--progress-interval", type=float, help="Segundos entre linhas de progresso")
+    output.add_argument("--results", metavar="ARQUIVO", help="Resultado por linha (.csv ou .jsonl)")
+    output.add_argument("--failed-rows", metavar="ARQUIVO", help="CSV com as linhas que falharam, para reenvio")
+    output.add_argument("--metrics-json", help="Grava snapshots periódicos das métricas (JSONL)")
+    output.add_argument("--metrics-prometheus", help="Grava as métricas no formato texto do Prometheus")
+    output.add_argument("--metrics-interval", type=float, help="Segundos entre snapshots das métricas")
+    output.add_argument("--quiet", action="store_true", help="Mostra apenas o resumo final")
+    return parser
+
+
+def _load_json_arg(value):
+    """Lê um argumento JSON informado diretamente ou como caminho de arquivo."""
+    if os.path.isfile(value):
+        with open(value, encoding="utf-8") as f:
+            return json.load(f)
+    return json.loads(value)
+
+
+def _coerce(name, value):
+    """Converte um valor textual (env/--set) para o tipo do padrão em Settings."""
+    current = getattr(Settings, name)
+    if isinstance(value, str):
+        if isinstance(current, bool):
+            return value.strip().lower() in ("1", "true", "yes", "sim", "on")
+        if isinstance(current, int):
+            return float(value) if "." in value else int(value)
+        if isinstance(current, float):
+            return float(value)
+        if isinstance(current, (dict, list)) or (current is None and value.lstrip().startswith(("{", "["))):
+            return json.loads(value)
+        if isinstance(current, tuple):
+            return tuple(int(v) if v.strip().isdigit() else v.strip() for v in value.split(",") if v.strip())
+    elif isinstance(current, tuple) and isinstance(value, list):
+        return tuple(value)
+    return value
+
+
+def _apply_setting(name, value):
+    if not hasattr(Settings, name):
+        raise ValueError(f"Configuração desconhecida: {name}")
+    setattr(Settings, name, _coerce(name, value))
+
+
+def configure(args, environ=None):
+    """
+    Aplica as configurações em Settings, da menor para a maior precedência:
+    arquivo --config, variáveis de ambiente, --set e flags.
+    """
+    environ = os.environ if environ is None else environ
+
+    if args.config:
+        with open(args.config, encoding="utf-8") as f:
+            for name, value in json.load(f).items():
+                _apply_setting(name, value)
+
+    for key, value in environ.items():
+        if key.startswith(ENV_PREFIX):
+            _apply_setting(key[len(ENV_PREFIX):], value)
+
+    for item in args.set:
+        name, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"Use NOME=VALOR em --set: {item}")
+        _apply_setting(name.strip(), value)
+
+    for flag, name in FLAG_SETTINGS.items():
+        value = getattr(args, flag)
+        if value is not None:
+            setattr(Settings, name, value)
+
+
+def _stderr(message):
+    print(message, file=sys.stderr, flush=True)
+
+
+def run(argv=None):
+    """
+    Executa um envio completo pela linha de comando e retorna o código de saída.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        configure(args)
+    except (OSError, ValueError) as e:
+        _stderr(f"❌ {e}")
+        return EXIT_USAGE
+
+    settings = Settings()
+    if not os.path.isfile(args.csv_file):
+        _stderr(f"❌ Arquivo não encontrado: {args.csv_file}")
+        return EXIT_USAGE
+    if not settings.ENDPOINTS and (not settings.ENDPOINT_URL or settings.ENDPOINT_URL == "https://"):
+        _stderr("❌ Informe o endpoint com --url ou --endpoint (ou ENDPOINT_URL/ENDPOINTS).")
+        return EXIT_USAGE
+
+    logger = None if args.quiet else _stderr
+
+    auth_service = None
+    if settings.CLIENT_ID and settings.CLIENT_SECRET:
+        auth_service = AuthService(
+            auth_url=settings.AUTH_URL,
+            client_id=settings.CLIENT_ID,
+            client_secret=settings.CLIENT_SECRET,
+            token_json_path=settings.TOKEN_JSON_PATH,
+            logger=_stderr,
+        )
+        if not auth_service.get_token_sync():
+            return EXIT_AUTH
+
+    try:
+        if settings.PROCESSES > 1:
+            uploader = ShardedUploader(
+                file_path=args.csv_file,
+                auth_token=args.token,
+                endpoint_url=settings.ENDPOINT_URL,
+                delimiter=settings.DELIMITER,
+                method=settings.METHOD,
+                concurrency=settings.CONCURRENCY,
+                logger=logger,
+                processes=settings.PROCESSES,
+                auth_config=auth_service and {
+                    "auth_url": auth_service.auth_url,
+                    "client_id": auth_service.client_id,
+                    "client_secret": auth_service.client_secret,
+                    "token_json_path": auth_service.token_json_path,
+                },
+            )
+        else:
+            uploader = UploaderService(
+                file_path=args.csv_file,
+                auth_token=args.token,
+                endpoint_url=settings.ENDPOINT_URL,
+                delimiter=settings.DELIMITER,
+                method=settings.METHOD,
+                concurrency=settings.CONCURRENCY,
+                logger=logger,
+                auth_service=auth_service,
+            )
+    except ValueError as e:
+        _stderr(f"❌ {e}")
+        return EXIT_USAGE
+
+    started = time.monotonic()
+    interrupted = False
+    try:
+        uploader.start_upload()
+    except KeyboardInterrupt:
+        interrupted = True
+    elapsed = time.monotonic() - started
+
+    done = uploader.ok_count + uploader.error_count
+    snapshot = uploader.metrics.last_snapshot or uploader.metrics.snapshot()
+    print("Resumo do envio")
+    print(f"  Linhas processadas: {done}")
+    print(f"  OK:                 {uploader.ok_count}")
+    print(f"  ERRO:               {uploader.error_count}")
+    print(f"  Retentativas:       {uploader.retry_count}")
+    if snapshot["counters"].get("rows_duplicate"):
+        print(f"  Repetidas:          {snapshot['counters']['rows_duplicate']}")
+    print(f"  Tempo:              {elapsed:.1f}s ({done / elapsed if elapsed > 0 else 0:.0f} linhas/s)")
+
+    latency = snapshot["latency"]
+    print(f"  Requisições:        {snapshot['requests']}")
+    print(f"  Latência:           p50 {latency['p50'] * 1000:.1f}ms, p90 {latency['p90'] * 1000:.1f}ms, "
+          f"p99 {latency['p99'] * 1000:.1f}ms, máx {latency['max'] * 1000:.1f}ms")
+    print(f"  Status HTTP:        {', '.join(f'{k}: {v}' for k, v in snapshot['statuses'].items()) or '-'}")
+    if snapshot["exceptions"]:
+        print(f"  Exceções:           {', '.join(f'{k}: {v}' for k, v in snapshot['exceptions'].items())}")
+    print(f"  Bytes enviados:     {snapshot['bytes_sent']}")
+    print(f"  Bytes recebidos:    {snapshot['bytes_received']}")
+
+    if interrupted:
+        print("  Envio interrompido.")
+        return EXIT_INTERRUPTED
+    if not uploader.completed:
+        print("  Envio não concluído.")
+        return EXIT_INCOMPLETE
+    return EXIT_ROW_ERRORS if uploader.error_count else EXIT_OK
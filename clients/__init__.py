@@ -1,7 +1,18 @@
 # clients/__init__.py
 
 from .http_client import HTTPClient
+from .retry_policy import RetryPolicy
+from .adaptive_limiter import AdaptiveLimiter
+from .rate_limiter import RateLimiter
+from .circuit_breaker import CircuitBreaker
+from .endpoint_balancer import Endpoint, EndpointBalancer
 
 __all__ = [
-  'HTTPClient'
+  'HTTPClient',
+  'RetryPolicy',
+  'AdaptiveLimiter',
+  'RateLimiter',
+  'CircuitBreaker',
+  'Endpoint',
+  'EndpointBalancer'
 ]
@@ -0,0 +1,105 @@
+# clients/adaptive_limiter.py
+import asyncio
+import time
+
+from config import Settings
+
+
+class AdaptiveLimiter:
+    """
+    Limitador de requisições simultâneas com limite dinâmico (AIMD).
+
+    Cada resposta saudável aumenta o limite em 1/limite (≈ +1 por "janela"),
+    e um sinal de sobrecarga (status 429/503, timeout ou latência muito acima
+    da base observada) o reduz multiplicativamente, no máximo uma vez por
+    tempo de resposta, respeitando os limites mínimo e máximo.
+    """
+
+    def __init__(self, initial=None, min_limit=None, max_limit=None, backoff_ratio=None,
+                 latency_tolerance=None, overload_statuses=None, logger=None):
+        settings = Settings()
+
+        self.min_limit = min_limit or settings.ADAPTIVE_MIN_CONCURRENCY
+        self.max_limit = max_limit or settings.ADAPTIVE_MAX_CONCURRENCY
+        self.backoff_ratio = backoff_ratio or settings.ADAPTIVE_BACKOFF_RATIO
+        self.latency_tolerance = latency_tolerance or settings.ADAPTIVE_LATENCY_TOLERANCE
+        self.overload_statuses = frozenset(
+            overload_statuses if overload_statuses is not None else settings.ADAPTIVE_OVERLOAD_STATUSES
+        )
+        self.logger = logger
+
+        self._limit = float(min(max(initial or settings.CONCURRENCY, self.min_limit), self.max_limit))
+        self.in_flight = 0
+        self._waiters = []
+        self._baseline_latency = None
+        self._avg_latency = None
+        self._last_decrease = 0.0
+
+    @property
+    def limit(self):
+        """Limite atual de requisições simultâneas."""
+        return int(self._limit)
+
+    def is_overload_status(self, status):
+        return status in self.overload_statuses
+
+    async def acquire(self):
+        """Aguarda até haver uma vaga dentro do limite atual."""
+        while self.in_flight >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.in_flight += 1
+
+    def release(self, latency=None, overload=False):
+        """
+        Libera a vaga e ajusta o limite conforme o resultado da requisição.
+
+        :param latency: Duração da requisição em segundos (None se não mediu)
+        :param overload: True se a requisição indicou sobrecarga do servidor
+        """
+        self.in_flight -= 1
+        if latency is not None:
+            overload = self._observe_latency(latency) or overload
+
+        if overload:
+            self._decrease()
+        else:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+        self._wake()
+
+    def _observe_latency(self, latency):
+        """
+        Atualiza a latência média e a de base; retorna True se a amostra
+        estiver acima da tolerância em relação à base.
+        """
+        if self._baseline_latency is None:
+            self._baseline_latency = self._avg_latency = latency
+            return False
+        self._avg_latency = 0.9 * self._avg_latency + 0.1 * latency
+        if latency < self._baseline_latency:
+            self._baseline_latency = latency
+        else:
+            # Deixa a base subir devagar para acompanhar mudanças reais
+            self._baseline_latency = 0.999 * self._baseline_latency + 0.001 * latency
+        return latency > self._baseline_latency * self.latency_tolerance
+
+    def _decrease(self):
+        now = time.monotonic()
+        if now - self._last_decrease < (self._avg_latency or 0.0):
+            return
+        self._last_decrease = now
+        old = self.limit
+        self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+        if self.logger and self.limit != old:
+            self.logger(f"⚠️ Sobrecarga detectada: concorrência {old} → {self.limit}")
+
+    def _wake(self):
+        free = self.limit - self.in_flight
+        for waiter in self._waiters[:max(0, free)]:
+            if not waiter.done():
+                waiter.set_result(None)
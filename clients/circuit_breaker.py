@@ -0,0 +1,131 @@
+# clients/circuit_breaker.py
+import asyncio
+import time
+from collections import deque
+
+from config import Settings
+
+
+class CircuitBreaker:
+    """
+    Disjuntor para o endpoint de envio.
+
+    Fechado, as requisições passam normalmente e os resultados recentes são
+    acompanhados. Muitas falhas seguidas, ou uma taxa de falha alta na
+    janela recente, abrem o circuito: novas requisições aguardam (as linhas
+    não são descartadas) até o fim do tempo de espera. Então o circuito
+    fica meio-aberto e deixa passar algumas requisições de teste; se todas
+    derem certo ele fecha e o envio volta à velocidade normal, senão abre
+    de novo.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "fechado", "aberto", "meio-aberto"
+    # Contador de métricas incrementado a cada transição para o estado
+    METRIC_NAMES = {CLOSED: "circuit_closed", OPEN: "circuit_opened", HALF_OPEN: "circuit_half_open"}
+
+    def __init__(self, consecutive_failures=None, failure_rate=None, window=None, min_calls=None,
+                 open_seconds=None, half_open_probes=None, failure_statuses=None, logger=None, metrics=None):
+        settings = Settings()
+
+        self.consecutive_failures = consecutive_failures or settings.CIRCUIT_CONSECUTIVE_FAILURES
+        self.failure_rate = failure_rate or settings.CIRCUIT_FAILURE_RATE
+        self.min_calls = min_calls or settings.CIRCUIT_MIN_CALLS
+        self.open_seconds = open_seconds or settings.CIRCUIT_OPEN_SECONDS
+        self.half_open_probes = half_open_probes or settings.CIRCUIT_HALF_OPEN_PROBES
+        self.failure_statuses = frozenset(
+            failure_statuses if failure_statuses is not None else settings.CIRCUIT_FAILURE_STATUSES
+        )
+        self.logger = logger
+        self.metrics = metrics
+
+        self.state = self.CLOSED
+        self._window = deque(maxlen=window or settings.CIRCUIT_WINDOW)
+        self._failures_in_window = 0
+        self._consecutive = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        self._changed = asyncio.Event()
+
+    def is_failure_status(self, status):
+        return status in self.failure_statuses
+
+    async def acquire(self):
+        """
+        Aguarda até o circuito permitir uma requisição.
+        Retorna True se a requisição é um teste do estado meio-aberto.
+        """
+        while True:
+            if self.state == self.CLOSED:
+                return False
+            if self.state == self.OPEN:
+                remaining = self._opened_at + self.open_seconds - time.monotonic()
+                if remaining > 0:
+                    await self._wait(remaining)
+                    continue
+                self._transition(self.HALF_OPEN)
+            if self._probes < self.half_open_probes:
+                self._probes += 1
+                return True
+            await self._wait(None)
+
+    async def _wait(self, timeout):
+        """Aguarda uma mudança de estado ou o timeout."""
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def record(self, success, probe=False):
+        """Registra o resultado de uma requisição liberada por acquire()."""
+        if probe:
+            if self.state != self.HALF_OPEN:
+                return
+            self._probes -= 1
+            if not success:
+                self._transition(self.OPEN)
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_probes:
+                self._transition(self.CLOSED)
+            return
+        if self.state != self.CLOSED:
+            # Requisição que já estava em andamento quando o circuito abriu
+            return
+
+        window = self._window
+        if len(window) == window.maxlen:
+            self._failures_in_window -= window[0]
+        window.append(0 if success else 1)
+        if success:
+            self._consecutive = 0
+            return
+        self._failures_in_window += 1
+        self._consecutive += 1
+        if self._consecutive >= self.consecutive_failures:
+            self._transition(self.OPEN, f"{self._consecutive} falhas seguidas")
+        elif len(window) >= self.min_calls and self._failures_in_window / len(window) >= self.failure_rate:
+            self._transition(self.OPEN, f"{self._failures_in_window}/{len(window)} falhas recentes")
+
+    def _transition(self, state, reason=None):
+        previous, self.state = self.state, state
+        if state == self.OPEN:
+            self._opened_at = time.monotonic()
+            message = f"⛔ Circuito aberto ({reason or 'teste falhou'}); pausando envios por {self.open_seconds:g}s"
+        elif state == self.HALF_OPEN:
+            self._probes = 0
+            self._probe_successes = 0
+            message = f"🔌 Circuito meio-aberto: testando o endpoint com {self.half_open_probes} requisição(ões)"
+        else:
+            self._window.clear()
+            self._failures_in_window = 0
+            self._consecutive = 0
+            message = "✅ Circuito fechado: endpoint respondendo, retomando o envio"
+        if self.metrics is not None:
+            self.metrics.inc(self.METRIC_NAMES[state])
+        if self.logger and previous != state:
+            self.logger(message)
+        # Acorda quem está aguardando para reavaliar o novo estado
+        self._changed.set()
+        self._changed = asyncio.Event()
+
@@ -0,0 +1,160 @@
+# clients/endpoint_balancer.py
+import asyncio
+import math
+import time
+
+from config import Settings
+
+
+class Endpoint:
+    """Um endpoint de envio, com seu peso, seu pool de conexões e estatísticas."""
+
+    def __init__(self, url, weight=1):
+        self.url = url
+        self.weight = float(weight)
+        if self.weight <= 0:
+            raise ValueError(f"Peso inválido para o endpoint {url}: {weight}")
+        self.client = None
+        self.in_flight = 0
+        self.latency = None  # EWMA da latência (s)
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        self._consecutive_failures = 0
+        self._probation = False
+
+    def is_ejected(self, now):
+        return now < self.ejected_until
+
+
+class EndpointBalancer:
+    """
+    Distribui as requisições entre vários endpoints equivalentes.
+
+    Cada endpoint tem uma fatia da concorrência proporcional ao seu peso
+    (recalculada entre os endpoints saudáveis) e a escolha entre os que têm
+    vaga é pelo menor número de requisições em andamento ou pela menor
+    latência média (EWMA) ponderada pela carga. Um endpoint com falhas
+    seguidas é retirado temporariamente; ao voltar, uma única falha o
+    retira de novo, até a primeira resposta bem-sucedida.
+    """
+
+    STRATEGIES = ("least_in_flight", "ewma")
+
+    def __init__(self, endpoints, concurrency, strategy=None, eject_failures=None, eject_seconds=None,
+                 ewma_decay=None, failure_statuses=None, logger=None, metrics=None):
+        settings = Settings()
+
+        self.endpoints = [
+            endpoint if isinstance(endpoint, Endpoint) else parse_endpoint(endpoint)
+            for endpoint in endpoints
+        ]
+        if not self.endpoints:
+            raise ValueError("Informe ao menos um endpoint.")
+        self.concurrency = concurrency
+        self.strategy = strategy or settings.ENDPOINT_STRATEGY
+        if self.strategy not in self.STRATEGIES:
+            raise ValueError(f"Estratégia de balanceamento desconhecida: {self.strategy}")
+        self.eject_failures = eject_failures or settings.ENDPOINT_EJECT_FAILURES
+        self.eject_seconds = eject_seconds or settings.ENDPOINT_EJECT_SECONDS
+        self.ewma_decay = ewma_decay or settings.ENDPOINT_EWMA_DECAY
+        self.failure_statuses = frozenset(
+            failure_statuses if failure_statuses is not None else settings.CIRCUIT_FAILURE_STATUSES
+        )
+        self.logger = logger
+        self.metrics = metrics
+        self._changed = asyncio.Event()
+
+    def _shares(self, candidates):
+        """Fatia da concorrência de cada endpoint, proporcional ao peso."""
+        total = sum(endpoint.weight for endpoint in candidates)
+        return {
+            endpoint: max(1, math.ceil(self.concurrency * endpoint.weight / total))
+            for endpoint in candidates
+        }
+
+    def _score(self, endpoint):
+        if self.strategy == "ewma":
+            # Endpoints ainda sem medição são experimentados primeiro
+            return (endpoint.latency or 0.0) * (endpoint.in_flight + 1) / endpoint.weight
+        return endpoint.in_flight / endpoint.weight
+
+    async def acquire(self):
+        """Aguarda e reserva uma vaga no melhor endpoint disponível."""
+        while True:
+            now = time.monotonic()
+            healthy = [endpoint for endpoint in self.endpoints if not endpoint.is_ejected(now)]
+            if healthy:
+                shares = self._shares(healthy)
+                candidates = [endpoint for endpoint in healthy if endpoint.in_flight < shares[endpoint]]
+                if candidates:
+                    endpoint = min(candidates, key=self._score)
+                    endpoint.in_flight += 1
+                    return endpoint
+                timeout = None
+            else:
+                # Todos fora: espera o primeiro voltar (as linhas não são descartadas)
+                timeout = min(endpoint.ejected_until for endpoint in self.endpoints) - now
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def release(self, endpoint, latency=None, status=None, exception=None):
+        """Libera a vaga e atualiza latência e saúde do endpoint."""
+        endpoint.in_flight -= 1
+        endpoint.requests += 1
+        if latency is not None:
+            if endpoint.latency is None:
+                endpoint.latency = latency
+            else:
+                endpoint.latency += self.ewma_decay * (latency - endpoint.latency)
+
+        if exception is not None or status in self.failure_statuses:
+            endpoint.failures += 1
+            endpoint._consecutive_failures += 1
+            if endpoint._probation or endpoint._consecutive_failures >= self.eject_failures:
+                self._eject(endpoint)
+        else:
+            endpoint._consecutive_failures = 0
+            endpoint._probation = False
+        self._notify()
+
+    def _eject(self, endpoint):
+        now = time.monotonic()
+        if endpoint.is_ejected(now):
+            return
+        endpoint.ejected_until = now + self.eject_seconds
+        endpoint.ejections += 1
+        endpoint._consecutive_failures = 0
+        endpoint._probation = True
+        if self.metrics is not None:
+            self.metrics.inc("endpoint_ejections")
+        if self.logger:
+            self.logger(f"⏏️ Endpoint {endpoint.url} retirado por {self.eject_seconds:g}s após falhas")
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def format_summary(self):
+        """Resumo por endpoint: requisições, falhas, latência média e retiradas."""
+        parts = []
+        for endpoint in self.endpoints:
+            latency = f"{endpoint.latency * 1000:.1f}ms" if endpoint.latency is not None else "-"
+            parts.append(
+                f"{endpoint.url}: {endpoint.requests} req, {endpoint.failures} falhas, "
+                f"latência {latency}, {endpoint.ejections} retiradas"
+            )
+        return "; ".join(parts)
+
+
+def parse_endpoint(value):
+    """Aceita "url", (url, peso) ou {"url": ..., "weight": ...}."""
+    if isinstance(value, str):
+        return Endpoint(value)
+    if isinstance(value, dict):
+        return Endpoint(value["url"], value.get("weight", 1))
+    url, weight = value
+    return Endpoint(url, weight)
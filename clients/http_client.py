@@ -1,19 +1,89 @@
 # clients/http_client.py
 import aiohttp
-from jsonpath_ng import parse
 import asyncio
 import time
 import ssl
 import json
-import os
-from datetime import datetime
+from config import Settings
+from utils.error_sink import ErrorSink
+from utils.json_path import extract_first
+from utils import json_codec
 
 
 class HTTPClient:
     """
     Cliente HTTP assíncrono que suporta POST e GET, com Bearer Token opcional.
+    Mantém um único pool de conexões (keep-alive, cache de DNS e timeout)
+    durante toda a vida do cliente, evitando um handshake TCP/TLS por linha.
     """
 
+    def __init__(self, timeout=None, limit=None, limit_per_host=None, keepalive_timeout=None, dns_cache_ttl=None,
+                 error_sink=None, metrics=None):
+        """
+        :param timeout: Timeout total de cada requisição em segundos (padrão: Settings.HTTP_TIMEOUT)
+        :param limit: Máximo de conexões abertas no pool (0 = ilimitado)
+        :param limit_per_host: Máximo de conexões por host (0 = ilimitado)
+        :param keepalive_timeout: Segundos que uma conexão ociosa permanece aberta
+        :param dns_cache_ttl: Segundos de cache das resoluções de DNS
+        :param error_sink: ErrorSink para registrar erros (padrão: um próprio, criado em start())
+        :param metrics: utils.metrics.Metrics que recebe latência, status e bytes de cada requisição
+        """
+        settings = Settings()
+
+        self.timeout = timeout if timeout is not None else settings.HTTP_TIMEOUT
+        self.limit = limit if limit is not None else settings.HTTP_POOL_LIMIT
+        self.limit_per_host = limit_per_host if limit_per_host is not None else settings.HTTP_POOL_LIMIT_PER_HOST
+        self.keepalive_timeout = keepalive_timeout if keepalive_timeout is not None else settings.HTTP_KEEPALIVE_TIMEOUT
+        self.dns_cache_ttl = dns_cache_ttl if dns_cache_ttl is not None else settings.HTTP_DNS_CACHE_TTL
+        self.response_excerpt = settings.ERROR_LOG_RESPONSE_EXCERPT
+        self.idempotency_header = settings.IDEMPOTENCY_HEADER
+        self.error_sink = error_sink
+        self.metrics = metrics
+        self._owns_error_sink = error_sink is None
+        self._session = None
+
+    async def start(self):
+        """
+        Cria (uma única vez) o connector e a sessão compartilhados.
+        Deve ser chamado de dentro do event loop que fará as requisições.
+        """
+        if self.error_sink is None:
+            self.error_sink = ErrorSink().start()
+        if self._session is None or self._session.closed:
+            # Connector SSL que ignora verificação de certificado
+            connector = aiohttp.TCPConnector(
+                ssl=False,
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def close(self):
+        """
+        Fecha a sessão e todas as conexões do pool, gravando
+        os erros pendentes caso o ErrorSink seja deste cliente.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if self._owns_error_sink and self.error_sink is not None:
+            await asyncio.to_thread(self.error_sink.close)
+            self.error_sink = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
     @staticmethod
     def _generate_curl_command(method, url, headers=None, data=None):
         """
@@ -28,6 +98,8 @@ class HTTPClient:
         
         # Adicionar data para POST
         if method.upper() == "POST" and data:
+            if isinstance(data, bytes):
+                data = data.decode("utf-8", errors="replace")
             if isinstance(data, dict):
                 curl_parts.extend(["-d", f"'{json.dumps(data)}'"])
                 curl_parts.extend(["-H", "'Content-Type: application/json'"])
@@ -36,8 +108,13 @@ class HTTPClient:
         
         # Adicionar parâmetros para GET
         elif method.upper() == "GET" and data:
-            params = "&".join([f"{k}={v}" for k, v in data.items()])
-            url = f"{url}?{params}"
+            if isinstance(data, bytes):
+                data = data.decode("utf-8", errors="replace")
+            if isinstance(data, dict):
+                params = "&".join([f"{k}={v}" for k, v in data.items()])
+            else:
+                params = data
+            url = f"{url}{'&' if '?' in url else '?'}{params}"
         
         # Adicionar URL
         curl_parts.append(f"'{url}'")
@@ -47,119 +124,124 @@ class HTTPClient:
         
         return " ".join(curl_parts)
 
-    @staticmethod
-    def _log_error_to_file(curl_command, error_info, response_text=None):
+    def _log_request_error(self, method, url, headers, data, error_info, status=None, reason=None, response_text=None):
         """
-        Salva o comando cURL e informações de erro em um arquivo de log.
+        Gera o cURL da requisição e envia o registro de erro ao ErrorSink.
+        O cURL só é montado aqui, quando a requisição de fato falha,
+        para não custar nada às requisições bem-sucedidas.
         """
-        try:
-            # Criar diretório de logs se não existir
-            log_dir = "logs"
-            if not os.path.exists(log_dir):
-                os.makedirs(log_dir)
-            
-            # Nome do arquivo com timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            log_file = os.path.join(log_dir, f"http_errors_{timestamp}.log")
-            
-            # Conteúdo do log
-            log_content = f"""
-HTTP REQUEST ERROR LOG
-=====================
-Timestamp: {datetime.now().isoformat()}
-
-cURL Command:
-{curl_command}
-
-Error Information:
-{error_info}
-"""
-            
-            if response_text:
-                log_content += f"""
-Response Text:
-{response_text}
-"""
-            
-            log_content += "\n" + "="*50 + "\n"
-            
-            # Escrever no arquivo
-            with open(log_file, "w", encoding="utf-8") as f:
-                f.write(log_content)
-            
-            print(f"Erro HTTP logado em: {log_file}")
-            
-        except Exception as e:
-            print(f"Falha ao escrever log de erro: {e}")
+        if self.error_sink is None:
+            return
+        record = {
+            "method": method,
+            "url": url,
+            "status": status,
+            "reason": reason,
+            "error": error_info,
+            "curl": HTTPClient._generate_curl_command(method, url, headers, data),
+        }
+        if response_text:
+            record["response_excerpt"] = response_text[:self.response_excerpt]
+        self.error_sink.emit(record)
 
-    @staticmethod
-    async def send_request(method, url, data=None, token=None):
+    async def send_request(self, method, url, data=None, token=None, body=None, content_type=None,
+                           idempotency_key=None):
         """
-        Envia uma requisição HTTP assíncrona usando aiohttp.
+        Envia uma requisição HTTP assíncrona usando a sessão compartilhada.
         Suporta POST e GET. Se token for informado, usa Bearer Authorization.
-        Em caso de erro, salva o cURL e informações do erro em arquivo.
+        Em POST, `body` (bytes já codificados, com seu `content_type`)
+        substitui a serialização de `data` como JSON; em GET, `body` é a
+        query string já codificada, anexada à URL sem nova codificação.
+        Se `idempotency_key` for informada, vai no header de idempotência
+        (Settings.IDEMPOTENCY_HEADER) e é a mesma em todas as tentativas.
+        Em caso de erro, envia o cURL e informações do erro ao ErrorSink.
         """
         headers = {}
         if token:
             headers["Authorization"] = f"Bearer {token}"
+        if idempotency_key:
+            headers[self.idempotency_header] = idempotency_key
 
         method = method.upper()
-        
-        # Gerar comando cURL para logging
-        curl_command = HTTPClient._generate_curl_command(method, url, headers, data)
+        if method == "GET" and body is not None:
+            query = body.decode("utf-8") if isinstance(body, bytes) else body
+            data, body = query, None
+            if query:
+                url = f"{url}{'&' if '?' in url else '?'}{query}"
+        elif body is not None:
+            headers["Content-Type"] = content_type or "application/json"
+            data = body
+        elif method == "POST":
+            # Serializado aqui (orjson se disponível) para medir o tamanho
+            body = json_codec.dumps(data)
+            headers["Content-Type"] = "application/json"
 
-        # Criar connector SSL que ignora verificação de certificado
-        connector = aiohttp.TCPConnector(ssl=False)
+        session = await self.start()
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.request_started(len(body) if body is not None else 0)
+        started = time.monotonic()
 
         try:
-            async with aiohttp.ClientSession(connector=connector) as session:
-                if method == "POST":
-                    async with session.post(url, json=data, headers=headers) as resp:
-                        text = await resp.text()
-                        
-                        # Verificar se houve erro HTTP
-                        if resp.status >= 400:
-                            error_info = f"HTTP {resp.status}: {resp.reason}"
-                            HTTPClient._log_error_to_file(curl_command, error_info, text)
-                        
-                        return resp, text
-                        
-                elif method == "GET":
-                    async with session.get(url, params=data, headers=headers) as resp:
-                        text = await resp.text()
-                        
-                        # Verificar se houve erro HTTP
-                        if resp.status >= 400:
-                            error_info = f"HTTP {resp.status}: {resp.reason}"
-                            HTTPClient._log_error_to_file(curl_command, error_info, text)
-                        
-                        return resp, text
-                else:
-                    raise ValueError(f"Método HTTP desconhecido: {method}")
+            if method == "POST":
+                request = session.post(url, data=body, headers=headers)
+            elif method == "GET":
+                params = data if isinstance(data, dict) else None
+                request = session.get(url, params=params, headers=headers)
+            else:
+                raise ValueError(f"Método HTTP desconhecido: {method}")
+
+            async with request as resp:
+                raw = await resp.read()
+                text = await resp.text()
+                if metrics is not None:
+                    metrics.request_finished(time.monotonic() - started, status=resp.status, bytes_received=len(raw))
+
+                # Verificar se houve erro HTTP
+                if resp.status >= 400:
+                    error_info = f"HTTP {resp.status}: {resp.reason}"
+                    self._log_request_error(method, url, headers, data, error_info,
+                                            status=resp.status, reason=resp.reason, response_text=text)
+
+                return resp, text
                     
         except aiohttp.ClientError as e:
             # Erro de conexão/cliente
+            if metrics is not None:
+                metrics.request_finished(time.monotonic() - started, exception=e)
             error_info = f"aiohttp.ClientError: {str(e)}"
-            HTTPClient._log_error_to_file(curl_command, error_info)
+            self._log_request_error(method, url, headers, data, error_info)
             raise
             
         except Exception as e:
             # Outros erros
+            if metrics is not None:
+                metrics.request_finished(time.monotonic() - started, exception=e)
             error_info = f"Exception: {type(e).__name__}: {str(e)}"
-            HTTPClient._log_error_to_file(curl_command, error_info)
+            self._log_request_error(method, url, headers, data, error_info)
             raise
 
+    async def fetch(self, method, url, form=None, timeout=None):
+        """
+        Requisição auxiliar (autenticação, validação de URL) no mesmo pool
+        de conexões do envio. `form` é enviado como formulário urlencoded.
+        Não registra erros no ErrorSink, pois pode carregar credenciais.
+        Retorna (status, texto da resposta).
+        """
+        session = await self.start()
+        # Sem timeout explícito vale o da sessão (self.timeout); None desligaria o limite
+        kwargs = {"timeout": aiohttp.ClientTimeout(total=timeout)} if timeout else {}
+        async with session.request(method.upper(), url, data=form, **kwargs) as resp:
+            return resp.status, await resp.text()
+
     @staticmethod
     def extract_token(json_data, json_path_str="$.access_token"):
         """
         Extrai o token do JSON retornado da autenticação usando JSONPath.
         Por padrão busca '$.access_token', mas o usuário pode passar outro JSONPath.
+        A expressão é compilada uma única vez e reutilizada (cache LRU).
         """
         try:
-            jsonpath_expr = parse(json_path_str)
-            matches = [match.value for match in jsonpath_expr.find(json_data)]
-            if matches:
-                return matches[0]
-            return None
+            return extract_first(json_data, json_path_str)
         except Exception as e:
             raise ValueError(f"Falha ao extrair token com JSONPath '{json_path_str}': {e}")
@@ -0,0 +1,90 @@
+# clients/rate_limiter.py
+import asyncio
+import time
+
+from config import Settings
+
+
+class RateLimiter:
+    """
+    Limitador assíncrono de taxa (token bucket).
+
+    Os tokens são repostos continuamente a `rate` por segundo, acumulando
+    até `burst`. Cada requisição consome um token; sem tokens, aguarda-se
+    o tempo exato até o próximo. Opcionalmente acompanha as cotas
+    informadas pelo servidor nos headers X-RateLimit-Remaining/Reset.
+    """
+
+    REMAINING_HEADER = "X-RateLimit-Remaining"
+    RESET_HEADER = "X-RateLimit-Reset"
+
+    def __init__(self, rate=None, burst=None, use_headers=None):
+        """
+        :param rate: Requisições por segundo
+        :param burst: Máximo de tokens acumulados (padrão: igual à taxa, mínimo 1)
+        :param use_headers: Se True, respeita os headers de cota das respostas
+        """
+        settings = Settings()
+
+        self.rate = float(rate or settings.RATE_LIMIT)
+        if self.rate <= 0:
+            raise ValueError("A taxa do RateLimiter deve ser maior que zero.")
+        self.burst = float(burst or settings.RATE_LIMIT_BURST or max(1.0, self.rate))
+        self.use_headers = settings.RATE_LIMIT_FROM_HEADERS if use_headers is None else use_headers
+
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = None
+
+    def _refill(self, now):
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+
+    async def acquire(self):
+        """Aguarda até haver um token disponível e o consome."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        # O lock garante ordem de chegada entre as corrotinas em espera
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def update_from_headers(self, headers):
+        """
+        Ajusta o bucket pela cota informada pelo servidor. Com a cota
+        esgotada, pausa o envio até o reset; caso contrário, nunca deixa
+        o bucket ter mais tokens do que a cota restante.
+        """
+        if not self.use_headers or not headers:
+            return
+        try:
+            remaining = int(headers.get(self.REMAINING_HEADER))
+        except (TypeError, ValueError):
+            return
+        try:
+            reset = float(headers.get(self.RESET_HEADER))
+        except (TypeError, ValueError):
+            reset = None
+
+        # Reset pode vir como epoch (segundos) ou como segundos restantes
+        if reset is not None and reset > 1e9:
+            reset -= time.time()
+
+        now = time.monotonic()
+        self._refill(now)
+        if remaining <= 0 and reset is not None and reset > 0:
+            self._tokens = 0.0
+            self._paused_until = max(self._paused_until, now + reset)
+        else:
+            self._tokens = min(self._tokens, float(max(remaining, 0)))
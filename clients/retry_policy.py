@@ -0,0 +1,80 @@
+# clients/retry_policy.py
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+import aiohttp
+from config import Settings
+
+
+class RetryPolicy:
+    """
+    Política de retentativas com backoff exponencial, full jitter e
+    suporte ao header Retry-After.
+    """
+
+    DEFAULT_EXCEPTIONS = (aiohttp.ClientError, asyncio.TimeoutError)
+
+    def __init__(self, max_attempts=None, base_delay=None, max_delay=None, retry_statuses=None,
+                 retry_exceptions=None, respect_retry_after=None, retry_after_max=None):
+        """
+        :param max_attempts: Total de tentativas por linha, incluindo a primeira
+        :param base_delay: Atraso base (segundos) do backoff exponencial
+        :param max_delay: Teto (segundos) do backoff exponencial
+        :param retry_statuses: Status HTTP que disparam nova tentativa
+        :param retry_exceptions: Tipos de exceção que disparam nova tentativa
+        :param respect_retry_after: Se True, usa o header Retry-After quando presente
+        :param retry_after_max: Teto (segundos) aplicado ao Retry-After
+        """
+        settings = Settings()
+
+        self.max_attempts = max_attempts or settings.RETRY_MAX_ATTEMPTS
+        self.base_delay = base_delay if base_delay is not None else settings.RETRY_BASE_DELAY
+        self.max_delay = max_delay if max_delay is not None else settings.RETRY_MAX_DELAY
+        self.retry_statuses = frozenset(retry_statuses if retry_statuses is not None else settings.RETRY_STATUSES)
+        self.retry_exceptions = tuple(retry_exceptions) if retry_exceptions is not None else self.DEFAULT_EXCEPTIONS
+        self.respect_retry_after = (
+            respect_retry_after if respect_retry_after is not None else settings.RETRY_RESPECT_RETRY_AFTER
+        )
+        self.retry_after_max = retry_after_max if retry_after_max is not None else settings.RETRY_AFTER_MAX
+
+    def should_retry(self, attempt, status=None, exception=None):
+        """
+        Retorna True se a tentativa número `attempt` (começando em 1)
+        falhou de forma retentável e ainda há tentativas disponíveis.
+        """
+        if attempt >= self.max_attempts:
+            return False
+        if exception is not None:
+            return isinstance(exception, self.retry_exceptions)
+        return status in self.retry_statuses
+
+    def compute_delay(self, attempt, headers=None):
+        """
+        Calcula quanto esperar antes da próxima tentativa.
+        Usa o Retry-After da resposta quando houver; caso contrário,
+        full jitter: uniforme entre 0 e min(max_delay, base_delay * 2^(attempt-1)).
+        """
+        if self.respect_retry_after and headers:
+            retry_after = self.parse_retry_after(headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.retry_after_max)
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def parse_retry_after(value):
+        """
+        Converte o header Retry-After (segundos ou HTTP-date) em segundos.
+        Retorna None se ausente ou inválido.
+        """
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return None
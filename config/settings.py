@@ -18,4 +18,134 @@ class Settings:
   CONCURRENCY = 10
 
   # Timeout das requisições HTTP (em segundos)
-  HTTP_TIMEOUT = 10
\ No newline at end of file
+  HTTP_TIMEOUT = 10
+
+  # Pool de conexões HTTP (compartilhado durante todo o envio)
+  HTTP_POOL_LIMIT = 0             # Total de conexões simultâneas (0 = ilimitado; nunca abaixo do nº de workers)
+  HTTP_POOL_LIMIT_PER_HOST = 0    # Conexões por host (0 = usa a concorrência)
+  HTTP_KEEPALIVE_TIMEOUT = 30     # Segundos que uma conexão ociosa fica aberta
+  HTTP_DNS_CACHE_TTL = 300        # Segundos de cache de DNS
+
+  # Pipeline de envio: linhas lidas antecipadamente por worker
+  QUEUE_SIZE_PER_WORKER = 2
+
+  # Log de erros HTTP (JSONL com rotação, escrito em background)
+  ERROR_LOG_DIR = "logs"
+  ERROR_LOG_FILE = "http_errors.jsonl"
+  ERROR_LOG_MAX_BYTES = 50 * 1024 * 1024   # Rotaciona ao atingir o tamanho (0 = desativado)
+  ERROR_LOG_ROTATE_SECONDS = 0             # Rotaciona a cada N segundos (0 = desativado)
+  ERROR_LOG_RESPONSE_EXCERPT = 2000        # Máximo de caracteres da resposta por registro
+  ERROR_LOG_BATCH_SIZE = 500
+  ERROR_LOG_FLUSH_INTERVAL = 1.0
+  ERROR_LOG_QUEUE_SIZE = 10000
+
+  # Logs da GUI
+  LOG_MAX_LINES = 1000            # Linhas mantidas na aba de logs
+  LOG_FILE = ""                   # Arquivo com o log completo ("" = desativado)
+  LOG_FLUSH_INTERVAL_MS = 100     # Intervalo de atualização da aba de logs
+  LOG_BATCH_SIZE = 5000           # Máximo de mensagens processadas por atualização
+  LOG_SUCCESS_SAMPLE = 0          # Loga 1 a cada N linhas OK (0 = só resumos por segundo)
+  LOG_SUMMARY_INTERVAL = 1.0      # Segundos entre resumos de progresso
+
+  # Retentativas (backoff exponencial com full jitter)
+  RETRY_MAX_ATTEMPTS = 5          # Tentativas por linha, incluindo a primeira (1 = sem retry)
+  RETRY_BASE_DELAY = 0.5          # Segundos antes da primeira retentativa
+  RETRY_MAX_DELAY = 30            # Teto do backoff exponencial
+  RETRY_STATUSES = (408, 425, 429, 500, 502, 503, 504)
+  RETRY_RESPECT_RETRY_AFTER = True
+  RETRY_AFTER_MAX = 300           # Teto aplicado ao header Retry-After
+
+  # Concorrência adaptativa (AIMD): cresce enquanto a API responde bem
+  ADAPTIVE_CONCURRENCY = False
+  ADAPTIVE_MIN_CONCURRENCY = 1
+  ADAPTIVE_MAX_CONCURRENCY = 200
+  ADAPTIVE_BACKOFF_RATIO = 0.7            # Fator multiplicativo ao detectar sobrecarga
+  ADAPTIVE_LATENCY_TOLERANCE = 2.0        # Latência acima de N x a base conta como sobrecarga
+  ADAPTIVE_OVERLOAD_STATUSES = (429, 503)
+
+  # Limite de taxa (token bucket) antes de cada requisição
+  RATE_LIMIT = 0                  # Requisições por segundo (0 = sem limite)
+  RATE_LIMIT_BURST = 0            # Rajada máxima (0 = igual à taxa)
+  RATE_LIMIT_FROM_HEADERS = False # Ajusta pelos headers X-RateLimit-Remaining/Reset
+
+  # Renovação proativa do token (segundos antes de expirar; no máximo metade da validade)
+  TOKEN_REFRESH_MARGIN = 60
+  TOKEN_REFRESH_BACKOFF = 1       # Espera (s) após uma renovação em background falhar, dobrando a cada falha
+  TOKEN_REFRESH_BACKOFF_MAX = 30
+  AUTH_TIMEOUT = 5                # Timeout (s) da requisição de token
+
+  # Checkpoint/retomada: linhas entregues ficam registradas em disco
+  CHECKPOINT_ENABLED = False
+  CHECKPOINT_DIR = "checkpoints"
+  CHECKPOINT_INTERVAL = 2.0       # Segundos entre gravações (com fsync) do journal
+
+  # Envio em lote: várias linhas do CSV por requisição
+  BATCH_SIZE = 1                  # Linhas por requisição (1 = desativado)
+  BATCH_MAX_BYTES = 1024 * 1024   # Tamanho máximo do corpo de um lote
+  BATCH_FORMAT = "array"          # "array" (JSON), "ndjson" ou "wrapper" ({chave: [...]})
+  BATCH_WRAPPER_KEY = "items"
+  BATCH_LINGER = 0.05             # Segundos aguardando novas linhas antes de enviar um lote parcial
+  BATCH_SPLIT_ON_FAILURE = True   # Divide lotes rejeitados para isolar a linha inválida
+
+  # Envio em vários processos (shards do CSV por faixa de bytes)
+  PROCESSES = 1                   # Processos de envio (1 = processo único)
+
+  # Métricas (latência, status, bytes, requisições em andamento)
+  METRICS_INTERVAL = 5.0          # Segundos entre snapshots/exportações
+  METRICS_JSON_FILE = ""          # JSONL com um snapshot por intervalo ("" = desativado)
+  METRICS_PROMETHEUS_FILE = ""    # Arquivo no formato texto do Prometheus ("" = desativado)
+
+  # JSONPath: expressões compiladas mantidas em cache (LRU)
+  JSON_PATH_CACHE_SIZE = 256
+
+  # Campos extraídos da resposta de cada linha: {"nome": "$.jsonpath"} (não disponível com BATCH_SIZE > 1)
+  RESPONSE_FIELDS = {}
+
+  # Leitura do CSV
+  CSV_BUFFER_SIZE = 1024 * 1024   # Bytes lidos do disco por vez
+  CSV_SCHEMA = {}                 # {"coluna": "str" | "int" | "float" | "bool" | "null" | "skip"}
+
+  # Template do corpo enviado por linha; None = a linha como objeto plano
+  # Ex.: {"customer": {"id": "{id}"}, "origem": "csv", "items": [{"sku": "{sku}"}]}
+  PAYLOAD_TEMPLATE = None
+
+  # Preview do CSV na GUI
+  PREVIEW_HEAD_BYTES = 64 * 1024  # Início do arquivo lido uma vez e reutilizado
+  PREVIEW_DEBOUNCE_MS = 300       # Espera após a última tecla antes de reinterpretar
+  PREVIEW_SNIFF_DELIMITER = True  # Detecta o delimitador ao abrir o arquivo
+
+  # Deduplicação de linhas e idempotência
+  DEDUP_MODE = "off"                  # "off", "exact" (todos os hashes) ou "bloom" (memória fixa)
+  DEDUP_KEY_COLUMNS = ()              # Colunas que identificam a linha; vazio = linha inteira
+  DEDUP_BLOOM_CAPACITY = 10_000_000   # Linhas distintas previstas no modo bloom
+  DEDUP_BLOOM_ERROR_RATE = 0.001      # Chance de descartar uma linha nova no modo bloom
+  IDEMPOTENCY_KEY = False             # Envia um Idempotency-Key derivado do hash da linha
+  IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+  # Resultado por linha e reenvio de falhas
+  RESULTS_FILE = ""               # .csv ou .jsonl com status/latência/campos por linha ("" = desligado)
+  FAILED_ROWS_FILE = ""           # CSV com as linhas que falharam, no layout do original
+  RESULTS_BATCH_SIZE = 1000
+  RESULTS_FLUSH_INTERVAL = 1.0
+  RESULTS_QUEUE_SIZE = 100000
+
+  # Entrega ordenada por chave (ex.: ("customer_id",)); vazio = sem ordenação
+  ORDER_KEY_COLUMNS = ()
+  ORDER_MAX_PARKED = 10000        # Linhas aguardando a anterior da mesma chave antes de pausar a leitura
+
+  # Disjuntor (circuit breaker) do endpoint de envio (opcional)
+  CIRCUIT_BREAKER_ENABLED = False
+  CIRCUIT_CONSECUTIVE_FAILURES = 20   # Falhas seguidas que abrem o circuito
+  CIRCUIT_FAILURE_RATE = 0.5          # Ou: fração de falhas na janela recente
+  CIRCUIT_WINDOW = 100                # Tamanho da janela (requisições)
+  CIRCUIT_MIN_CALLS = 20              # Mínimo na janela antes de avaliar a taxa
+  CIRCUIT_OPEN_SECONDS = 10           # Pausa antes de testar o endpoint de novo
+  CIRCUIT_HALF_OPEN_PROBES = 3        # Requisições de teste que precisam dar certo
+  CIRCUIT_FAILURE_STATUSES = (500, 502, 503, 504)
+
+  # Vários endpoints equivalentes (ex.: [{"url": "https://a/api", "weight": 2}, "https://b/api"])
+  ENDPOINTS = []                      # Vazio = apenas ENDPOINT_URL
+  ENDPOINT_STRATEGY = "least_in_flight"  # "least_in_flight" ou "ewma" (latência média x carga)
+  ENDPOINT_EJECT_FAILURES = 5         # Falhas seguidas que retiram o endpoint temporariamente
+  ENDPOINT_EJECT_SECONDS = 30
+  ENDPOINT_EWMA_DECAY = 0.3           # Peso da latência mais recente na média
@@ -2,12 +2,15 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import json
+import queue
+import asyncio
 import threading
 
-from utils.csv_utils import read_csv_preview
-from utils.logger import log_message
+from utils.csv_utils import read_csv_head, parse_csv_preview, sniff_delimiter, estimate_rows_from_sample
+from utils.logger import LogPipeline
 from services.uploader_service import UploaderService
 from services.auth_service import AuthService
+from clients.http_client import HTTPClient
 from config import Settings
 
 
@@ -17,6 +20,13 @@ class CSVPosterGUI:
         self.root.title("CSV to API Poster")
         self.csv_file = None
 
+        # Início do CSV lido uma vez; o preview é reinterpretado a partir dele
+        self._preview_head = None
+        self._preview_after = None
+
+        # Funções enviadas por outras threads para rodar na thread do Tk
+        self._ui_calls = queue.SimpleQueue()
+
         # Services (serão inicializados ao iniciar o envio)
         self.uploader_service = None
         self.auth_service = None
@@ -27,6 +37,7 @@ class CSVPosterGUI:
         # Variables
         self.method_var = tk.StringVar(value=getattr(self.settings, "METHOD", "POST"))
         self.auth_var = tk.BooleanVar(value=False)
+        self.adaptive_var = tk.BooleanVar(value=getattr(self.settings, "ADAPTIVE_CONCURRENCY", False))
 
         # Notebook e abas
         self.notebook = ttk.Notebook(root)
@@ -40,6 +51,9 @@ class CSVPosterGUI:
         self.build_config_tab()
         self.build_log_tab()
 
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.after(50, self._drain_ui_calls)
+
     # =====================
     # Aba de Configurações
     # =====================
@@ -66,6 +80,15 @@ class CSVPosterGUI:
         self.concurrency_entry = tk.Entry(frame, width=5)
         self.concurrency_entry.insert(0, str(getattr(self.settings, "CONCURRENCY", 10)))
         self.concurrency_entry.grid(row=2, column=1, sticky="w")
+        tk.Checkbutton(frame, text="Adaptativa", variable=self.adaptive_var).grid(row=2, column=2, sticky="w")
+
+        # Limite de taxa (requisições por segundo, 0 = sem limite)
+        rate_frame = ttk.Frame(frame)
+        rate_frame.grid(row=2, column=3, sticky="w")
+        tk.Label(rate_frame, text="Req/s:").pack(side="left")
+        self.rate_limit_entry = tk.Entry(rate_frame, width=6)
+        self.rate_limit_entry.insert(0, str(getattr(self.settings, "RATE_LIMIT", 0)))
+        self.rate_limit_entry.pack(side="left")
 
         # Autenticação
         self.auth_check = tk.Checkbutton(
@@ -108,6 +131,8 @@ class CSVPosterGUI:
         self.delimiter_entry.grid(row=6, column=1, sticky="w")
         self.delimiter_entry.insert(0, getattr(self.settings, "DELIMITER", ","))
         self.delimiter_entry.bind("<KeyRelease>", self.refresh_preview)
+        self.rows_label = tk.Label(frame, text="")
+        self.rows_label.grid(row=6, column=2, columnspan=2, sticky="w")
 
         # Body preview
         tk.Label(frame, text="Body Preview (primeiras linhas do CSV):").grid(row=7, column=0, sticky="w", pady=(10,0))
@@ -122,11 +147,41 @@ class CSVPosterGUI:
     # Aba de Logs
     # =====================
     def build_log_tab(self):
+        # Métricas do envio em andamento, atualizadas periodicamente
+        self.metrics_label = tk.Label(self.log_frame, text="Métricas: -", anchor="w", justify="left")
+        self.metrics_label.pack(padx=5, pady=(5, 0), fill="x")
+
         self.log_text = tk.Text(self.log_frame, height=25, width=100)
         self.log_text.pack(padx=5, pady=5, fill="both", expand=True)
 
+        # Mensagens chegam de outras threads e são aplicadas em lotes pelo Tk
+        self.log_pipeline = LogPipeline(
+            self.log_text,
+            max_lines=self.settings.LOG_MAX_LINES,
+            log_file=self.settings.LOG_FILE or None,
+            batch_size=self.settings.LOG_BATCH_SIZE,
+        )
+        self.log_pipeline.schedule(self.root, self.settings.LOG_FLUSH_INTERVAL_MS)
+        self.root.after(1000, self.refresh_metrics)
+
     def log(self, msg):
-        log_message(self.log_text, msg)
+        self.log_pipeline.put(msg)
+
+    def refresh_metrics(self):
+        """Mostra o último snapshot de métricas do envio (lido na thread do Tk)."""
+        uploader = self.uploader_service
+        snapshot = uploader.metrics.last_snapshot if uploader else None
+        if snapshot:
+            text = (
+                f"{snapshot['requests_per_second']:.0f} req/s | {uploader.current_concurrency} concorrência | "
+                f"{uploader.metrics.format_summary(snapshot)}"
+            )
+            self.metrics_label.config(text=text)
+        self.root.after(1000, self.refresh_metrics)
+
+    def on_close(self):
+        self.log_pipeline.close(self.root)
+        self.root.destroy()
 
     # =====================
     # Funções auxiliares
@@ -137,22 +192,71 @@ class CSVPosterGUI:
         else:
             self.auth_frame.grid_remove()
 
+    def _run_on_ui(self, func):
+        """Agenda func para rodar na thread do Tk (seguro a partir de outras threads)."""
+        self._ui_calls.put(func)
+
+    def _drain_ui_calls(self):
+        while True:
+            try:
+                func = self._ui_calls.get_nowait()
+            except queue.Empty:
+                break
+            func()
+        self.root.after(50, self._drain_ui_calls)
+
     def load_csv(self):
         file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
         if file_path:
             self.csv_file = file_path
+            self._preview_head = None
             self.csv_label.config(text=file_path.split("/")[-1])
-            self.refresh_preview()
+            self.rows_label.config(text="Lendo arquivo...")
+            # A leitura pode ser lenta (ex.: compartilhamentos de rede): fora da thread do Tk
+            threading.Thread(target=self._load_preview_head, args=(file_path,), daemon=True).start()
+
+    def _load_preview_head(self, file_path):
+        """Lê o início do arquivo, detecta o delimitador e estima as linhas (em outra thread)."""
+        try:
+            text, size = read_csv_head(file_path, self.settings.PREVIEW_HEAD_BYTES)
+            delimiter = sniff_delimiter(text) if self.settings.PREVIEW_SNIFF_DELIMITER else None
+            estimate = estimate_rows_from_sample(text.encode("utf-8"), size)
+        except Exception as e:
+            self._run_on_ui(lambda error=e: self._show_preview_error(file_path, error))
+            return
+        self._run_on_ui(lambda: self._apply_preview_head(file_path, text, delimiter, estimate))
+
+    def _apply_preview_head(self, file_path, text, delimiter, estimate):
+        if file_path != self.csv_file:
+            return  # Outro arquivo foi selecionado enquanto este era lido
+        self._preview_head = text
+        if delimiter:
+            self.delimiter_entry.delete(0, tk.END)
+            self.delimiter_entry.insert(0, delimiter)
+        self.rows_label.config(text=f"~{estimate:,} linhas (estimativa)".replace(",", "."))
+        self._render_preview()
+
+    def _show_preview_error(self, file_path, error):
+        if file_path != self.csv_file:
+            return
+        self.rows_label.config(text="")
+        self.body_preview.delete("1.0", tk.END)
+        self.body_preview.insert(tk.END, f"Erro ao ler CSV: {error}")
 
     def refresh_preview(self, event=None):
-        self.settings = Settings()
-        
-        if not self.csv_file:
+        """Reinterpreta o preview após uma pausa na digitação do delimitador."""
+        if self._preview_after is not None:
+            self.root.after_cancel(self._preview_after)
+        self._preview_after = self.root.after(self.settings.PREVIEW_DEBOUNCE_MS, self._render_preview)
+
+    def _render_preview(self):
+        self._preview_after = None
+        if self._preview_head is None:
             return
         delimiter = self.delimiter_entry.get().strip() or ","
         try:
             num_lines = self.settings.PREVIEW_LINES or 3
-            preview = read_csv_preview(self.csv_file, delimiter, num_lines)
+            preview = parse_csv_preview(self._preview_head, delimiter, num_lines)
             preview_json = json.dumps(preview, indent=4, ensure_ascii=False)
             self.body_preview.delete("1.0", tk.END)
             self.body_preview.insert(tk.END, preview_json)
@@ -165,16 +269,25 @@ class CSVPosterGUI:
         if not url:
             messagebox.showerror("Erro", "Informe a URL.")
             return
-        # Aqui só fazemos uma checagem rápida visual
+        canvas = self.status_canvas if parent_frame == self.config_frame else self.auth_status_canvas
+        # A checagem de rede roda fora da thread do Tk para não travar a janela
+        threading.Thread(target=self._check_url, args=(url, canvas), daemon=True).start()
+
+    def _check_url(self, url, canvas):
+        """Faz uma checagem rápida (HEAD) da URL em outra thread."""
+        async def head():
+            async with HTTPClient(timeout=5) as client:
+                status, _ = await client.fetch("HEAD", url)
+                return status
+
         try:
-            import requests
-            resp = requests.head(url, timeout=5)
-            valid = 200 <= resp.status_code < 400
+            valid = 200 <= asyncio.run(head()) < 400
         except Exception:
             valid = False
+        self._run_on_ui(lambda: self._show_url_status(url, canvas, valid))
 
+    def _show_url_status(self, url, canvas, valid):
         # Atualiza canvas de status
-        canvas = self.status_canvas if parent_frame == self.config_frame else self.auth_status_canvas
         canvas.delete("all")
         color = "green" if valid else "red"
         canvas.create_oval(0, 0, 20, 20, fill=color)
@@ -193,9 +306,10 @@ class CSVPosterGUI:
         method = self.method_var.get()
         delimiter = self.delimiter_entry.get().strip() or ","
         concurrency = int(self.concurrency_entry.get().strip() or 10)
+        rate_limit = float(self.rate_limit_entry.get().strip() or 0)
 
-        # Configurar AuthService se necessário
-        token = None
+        # Configurar AuthService se necessário; o token é obtido pelo próprio
+        # envio, em background, no mesmo pool de conexões
         if self.auth_var.get():
             self.auth_service = AuthService(
                 auth_url=self.auth_url_entry.get().strip(),
@@ -204,17 +318,19 @@ class CSVPosterGUI:
                 token_json_path=self.token_path_entry.get().strip() or "$.access_token",
                 logger=self.log
             )
-            token = self.auth_service.get_token_sync()
 
         # Configurar UploaderService
         self.uploader_service = UploaderService(
             file_path=self.csv_file,
-            auth_token=token,
+            auth_token=None,
             endpoint_url=url,
             delimiter=delimiter,
             method=method,
             concurrency=concurrency,
-            logger=self.log
+            logger=self.log,
+            adaptive=self.adaptive_var.get(),
+            rate_limit=rate_limit,
+            auth_service=self.auth_service if self.auth_var.get() else None
         )
 
         # Troca aba ativa para logs
@@ -1,9 +1,16 @@
 # main.py
-import tkinter as tk
-from gui.gui import CSVPosterGUI
+import sys
 
 
 def main():
+    # Com argumentos, roda o envio pela linha de comando (sem importar o tkinter)
+    if len(sys.argv) > 1:
+        from cli import run
+        sys.exit(run())
+
+    import tkinter as tk
+    from gui.gui import CSVPosterGUI
+
     root = tk.Tk()
     app = CSVPosterGUI(root)
     root.mainloop()
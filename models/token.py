@@ -13,6 +13,7 @@ class Token:
         :param expires_in: Tempo de validade em segundos
         """
         self.value = value
+        self.expires_in = expires_in  # Validade total, em segundos
         self.expires_at = time.time() + expires_in  # Timestamp de expiração
 
     def is_expired(self) -> bool:
@@ -2,5 +2,8 @@
 
 from .uploader_service import UploaderService
 from .auth_service import AuthService
+from .batching import BatchEncoder
+from .payload_template import PayloadTemplate
+from .sharded_uploader import ShardedUploader
 
-__all__ = ["UploaderService", "AuthService"]
\ No newline at end of file
+__all__ = ["UploaderService", "AuthService", "BatchEncoder", "PayloadTemplate", "ShardedUploader"]
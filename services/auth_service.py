@@ -1,24 +1,31 @@
 # services/auth_service.py
+import json
 import time
-import requests
-import urllib3
+import asyncio
 from clients.http_client import HTTPClient
 from models.token import Token
+from config import Settings
 from utils.logger import log_message
 
-# Desabilitar warnings de SSL quando verify=False
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
 
 class AuthService:
     """
     Serviço responsável por autenticação e cache de token.
     O token é renovado somente quando expirar ou se recebermos 401.
+
+    Durante o envio, get_token_async renova o token em background pouco antes
+    de expirar, e handle_unauthorized garante uma única renovação por 401,
+    compartilhada por todos os workers que receberam o mesmo token rejeitado.
+
+    O token é obtido de forma assíncrona pelo aiohttp; durante o envio,
+    bind_client faz a autenticação usar o mesmo pool de conexões do upload.
+    get_token_sync continua disponível para quem está fora de um event loop.
     """
 
     def __init__(self, auth_url=None, client_id=None, client_secret=None, token_json_path="$.access_token", logger=None, log_widget=None):
         self._cached_token = None
-        self.http_client = HTTPClient()
+        # Cliente do envio em andamento (bind_client); sem ele, cada busca usa um temporário
+        self.http_client = None
         self.auth_url = auth_url
         self.client_id = client_id
         self.client_secret = client_secret
@@ -26,6 +33,14 @@ class AuthService:
         self.expires_json_path = "$.expires_in"
         self.logger = logger
         self.log_widget = log_widget
+        self.refresh_margin = Settings().TOKEN_REFRESH_MARGIN
+        self.refresh_backoff = Settings().TOKEN_REFRESH_BACKOFF
+        self.refresh_backoff_max = Settings().TOKEN_REFRESH_BACKOFF_MAX
+        self.timeout = Settings().AUTH_TIMEOUT
+        self._refresh_future = None
+        # Backoff da renovação em background após falhas consecutivas
+        self._refresh_failures = 0
+        self._refresh_retry_at = 0.0
 
     def log(self, message):
         if self.logger:
@@ -35,44 +50,76 @@ class AuthService:
         else:
             print(message)
 
-    def get_token_sync(self):
+    def bind_client(self, client):
         """
-        Método síncrono para obter token, usado pela GUI.
+        Passa a obter tokens pelo HTTPClient informado (o do envio), ou volta
+        a usar um cliente temporário por busca com None. Deve ser chamado no
+        event loop do cliente.
+        """
+        self.http_client = client
+
+    def get_token_sync(self, force=False):
+        """
+        Método síncrono para obter token, para uso fora de um event loop.
         Usa as configurações passadas no construtor.
+        Com force=True, ignora o cache e solicita um novo token.
         """
-        if not all([self.auth_url, self.client_id, self.client_secret]):
-            self.log("❌ Configurações de autenticação incompletas")
-            return None
-            
-        return self.get_token(
-            self.auth_url, 
-            self.client_id, 
-            self.client_secret, 
-            self.token_json_path, 
-            self.expires_json_path
-        )
-
-    def get_token(self, auth_url, client_id, client_secret, token_path="$.access_token", expires_path="$.expires_in"):
+        if not force and self._cached_token and not self._cached_token.is_expired():
+            self.log("🔑 Usando token em cache")
+            return self._cached_token.value
+
+        async def fetch():
+            # Cliente temporário: o event loop deste asyncio.run termina aqui
+            async with HTTPClient() as client:
+                return await self._fetch_token(client)
+
+        return asyncio.run(fetch())
+
+    def get_token(self, auth_url, client_id, client_secret, token_path="$.access_token", expires_path="$.expires_in",
+                  force=False):
         """
         Retorna um token válido, reutilizando do cache se ainda não expirou.
         """
-        if self._cached_token and not self._cached_token.is_expired():
-            self.log("🔑 Usando token em cache")
+        self.auth_url = auth_url
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.token_json_path = token_path
+        self.expires_json_path = expires_path
+        return self.get_token_sync(force)
+
+    async def fetch_token(self, force=False):
+        """
+        Versão assíncrona de get_token_sync, no cliente vinculado (ou num
+        temporário, fechado ao final). Não deduplica chamadas concorrentes;
+        durante o envio use get_token_async.
+        """
+        if not force and self._cached_token and not self._cached_token.is_expired():
             return self._cached_token.value
+        if self.http_client is not None:
+            return await self._fetch_token(self.http_client)
+        async with HTTPClient() as client:
+            return await self._fetch_token(client)
+
+    async def _fetch_token(self, client):
+        """Solicita um novo token e atualiza o cache. Retorna None em caso de falha."""
+        if not all([self.auth_url, self.client_id, self.client_secret]):
+            self.log("❌ Configurações de autenticação incompletas")
+            return None
 
         self.log("🔑 Solicitando novo token de autenticação...")
         payload = {
-            "client_id": client_id,
-            "client_secret": client_secret,
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
             "grant_type": "client_credentials"
         }
 
         try:
-            response = requests.post(auth_url, data=payload, timeout=5, verify=False)
-            response.raise_for_status()
-            json_data = response.json()
-            token_value = self.http_client.extract_token(json_data, token_path)
-            expires_in = self.http_client.extract_token(json_data, expires_path)
+            status, text = await client.fetch("POST", self.auth_url, form=payload, timeout=self.timeout)
+            if status >= 400:
+                raise ValueError(f"HTTP {status}")
+            json_data = json.loads(text)
+            token_value = HTTPClient.extract_token(json_data, self.token_json_path)
+            expires_in = HTTPClient.extract_token(json_data, self.expires_json_path)
 
             if not token_value or expires_in is None:
                 raise ValueError("Token ou expires_in não encontrados na resposta.")
@@ -85,6 +132,63 @@ class AuthService:
             self.log(f"❌ Falha ao obter token: {e}")
             return None
 
+    async def get_token_async(self):
+        """
+        Retorna o token atual para uma requisição do envio.
+        Se não houver token válido, aguarda a renovação (única, compartilhada);
+        se faltar pouco para expirar, dispara a renovação em background e
+        devolve o token atual, que ainda é válido.
+
+        A margem é limitada à metade da validade do token: com tokens curtos
+        (menores que a margem), um token recém-obtido não dispara outra
+        renovação. Após uma falha, a renovação em background espera um
+        backoff exponencial antes de tentar de novo.
+        """
+        token = self._cached_token
+        if token is None or token.is_expired():
+            return await self._refresh()
+        margin = min(self.refresh_margin, token.expires_in / 2)
+        if (
+            token.remaining_seconds() <= margin
+            and self._refresh_future is None
+            and time.monotonic() >= self._refresh_retry_at
+        ):
+            self.log(f"🔑 Token expira em {token.remaining_seconds()}s, renovando em background...")
+            self._refresh_future = asyncio.ensure_future(self._do_refresh())
+        return token.value
+
+    async def handle_unauthorized(self, rejected_token):
+        """
+        Trata um 401 recebido com `rejected_token`. Se outro worker já
+        renovou o token, devolve o novo; senão, dispara (ou aguarda) uma
+        única renovação. Retorna None se não foi possível obter token.
+        """
+        token = self._cached_token
+        if token is not None and token.value != rejected_token and not token.is_expired():
+            return token.value
+        return await self._refresh()
+
+    async def _refresh(self):
+        """Single-flight: todas as corrotinas aguardam a mesma renovação."""
+        if self._refresh_future is None:
+            self._refresh_future = asyncio.ensure_future(self._do_refresh())
+        # shield: o cancelamento de um worker não cancela a renovação dos demais
+        return await asyncio.shield(self._refresh_future)
+
+    async def _do_refresh(self):
+        try:
+            value = await self.fetch_token(force=True)
+        finally:
+            self._refresh_future = None
+        if value is None:
+            self._refresh_failures += 1
+            delay = min(self.refresh_backoff * 2 ** (self._refresh_failures - 1), self.refresh_backoff_max)
+            self._refresh_retry_at = time.monotonic() + delay
+        else:
+            self._refresh_failures = 0
+            self._refresh_retry_at = 0.0
+        return value
+
     def invalidate_token(self):
         """Invalida o token em cache, forçando renovação na próxima chamada."""
         self._cached_token = None
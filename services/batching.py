@@ -0,0 +1,42 @@
+# services/batching.py
+import json
+
+from config import Settings
+
+
+class BatchEncoder:
+    """
+    Monta o corpo de uma requisição em lote a partir de várias linhas.
+
+    Cada linha chega já serializada (PayloadTemplate.render); o corpo final
+    é apenas a concatenação desses pedaços no formato escolhido, o que
+    também permite controlar o tamanho exato do lote em bytes.
+    """
+
+    FORMATS = ("array", "ndjson", "wrapper")
+
+    def __init__(self, batch_format=None, wrapper_key=None):
+        settings = Settings()
+
+        self.batch_format = batch_format or settings.BATCH_FORMAT
+        if self.batch_format not in self.FORMATS:
+            raise ValueError(f"Formato de lote desconhecido: {self.batch_format}")
+        self.wrapper_key = wrapper_key or settings.BATCH_WRAPPER_KEY
+
+        if self.batch_format == "ndjson":
+            self.content_type = "application/x-ndjson"
+            self._prefix, self._separator, self._suffix = b"", b"\n", b"\n"
+        else:
+            self.content_type = "application/json"
+            self._prefix, self._separator, self._suffix = b"[", b",", b"]"
+            if self.batch_format == "wrapper":
+                self._prefix = b"{" + json.dumps(self.wrapper_key).encode() + b":["
+                self._suffix = b"]}"
+
+    def overhead(self, count):
+        """Bytes ocupados pelo envelope e separadores de um lote com `count` linhas."""
+        return len(self._prefix) + len(self._suffix) + len(self._separator) * max(0, count - 1)
+
+    def encode_batch(self, pieces):
+        """Junta as linhas já serializadas no corpo final do lote."""
+        return self._prefix + self._separator.join(pieces) + self._suffix
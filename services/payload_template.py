@@ -0,0 +1,136 @@
+# services/payload_template.py
+import re
+from urllib.parse import quote_plus
+
+from config import Settings
+from utils.json_codec import encode_value, dumps
+
+# "{coluna}" referencia uma coluna do CSV; "{{texto}}" é o literal "{texto}"
+_COLUMN_REF = re.compile(r"^\{([^{}]+)\}$")
+_ESCAPED = re.compile(r"^\{\{.*\}\}$")
+
+
+class PayloadTemplate:
+    """
+    Modelo do corpo enviado para cada linha, compilado uma única vez.
+
+    O modelo é uma estrutura JSON (dicts, listas e constantes) em que
+    strings no formato "{coluna}" são trocadas pelo valor da coluna, o que
+    permite aninhar, renomear e acrescentar constantes. Na compilação todas
+    as partes fixas viram texto JSON pronto; renderizar uma linha é apenas
+    codificar os valores das colunas e juntar os pedaços, sem montar um
+    dict por linha nem serializar o documento inteiro.
+    """
+
+    def __init__(self, template, columns):
+        self.template = template
+        self.columns = tuple(columns)
+        index = {name: i for i, name in enumerate(self.columns)}
+
+        # Pedaços alternados: texto fixo, índice de coluna, texto fixo, ...
+        self._parts = []
+        self._fixed = []
+        missing = []
+        self._compile(template, index, missing)
+        if missing:
+            raise ValueError(f"Colunas do template ausentes no CSV: {', '.join(sorted(set(missing)))}")
+        self._flush_fixed()
+
+        # Query string (GET): só para templates planos
+        self._query = None
+        if isinstance(template, dict) and all(not isinstance(v, (dict, list)) for v in template.values()):
+            self._query = [(quote_plus(str(key)), self._query_slot(value, index)) for key, value in template.items()]
+
+    @classmethod
+    def identity(cls, columns):
+        """Template que reproduz a linha como um objeto plano {coluna: valor}."""
+        return cls({name: "{" + name + "}" for name in columns}, columns)
+
+    @classmethod
+    def from_settings(cls, columns, template=None):
+        """Compila o template informado, o de Settings, ou o de identidade."""
+        template = Settings().PAYLOAD_TEMPLATE if template is None else template
+        if not template:
+            return cls.identity(columns)
+        return cls(template, columns)
+
+    def _flush_fixed(self):
+        if self._fixed:
+            self._parts.append("".join(self._fixed))
+            self._fixed.clear()
+
+    def _compile(self, node, index, missing):
+        fixed = self._fixed
+        if isinstance(node, dict):
+            fixed.append("{")
+            for i, (key, value) in enumerate(node.items()):
+                if i:
+                    fixed.append(",")
+                fixed.append(encode_value(str(key)))
+                fixed.append(":")
+                self._compile(value, index, missing)
+            fixed.append("}")
+        elif isinstance(node, list):
+            fixed.append("[")
+            for i, value in enumerate(node):
+                if i:
+                    fixed.append(",")
+                self._compile(value, index, missing)
+            fixed.append("]")
+        elif isinstance(node, str) and _COLUMN_REF.match(node):
+            name = node[1:-1]
+            if name not in index:
+                missing.append(name)
+                return
+            self._flush_fixed()
+            self._parts.append(index[name])
+        else:
+            if isinstance(node, str) and _ESCAPED.match(node):
+                node = node[1:-1]
+            fixed.append(encode_value(node))
+
+    @staticmethod
+    def _query_slot(value, index):
+        if isinstance(value, str) and _COLUMN_REF.match(value):
+            return index[value[1:-1]]
+        if isinstance(value, str) and _ESCAPED.match(value):
+            value = value[1:-1]
+        return quote_plus(_query_text(value))
+
+    @property
+    def supports_query(self):
+        """Indica se o template pode ser enviado como query string (GET)."""
+        return self._query is not None
+
+    def render(self, values):
+        """Renderiza uma linha (sequência alinhada a `columns`) como JSON em bytes."""
+        size = len(values)
+        out = []
+        for part in self._parts:
+            if part.__class__ is int:
+                out.append(encode_value(values[part] if part < size else None))
+            else:
+                out.append(part)
+        return "".join(out).encode("utf-8")
+
+    def render_query(self, values):
+        """Renderiza uma linha como query string já codificada (templates planos)."""
+        if self._query is None:
+            raise ValueError("Templates aninhados não podem ser enviados como query string (GET).")
+        size = len(values)
+        pairs = []
+        for key, slot in self._query:
+            if slot.__class__ is int:
+                slot = quote_plus(_query_text(values[slot] if slot < size else None))
+            pairs.append(f"{key}={slot}")
+        return "&".join(pairs)
+
+
+def _query_text(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return dumps(value).decode("utf-8")
+    return str(value)
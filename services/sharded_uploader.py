@@ -0,0 +1,285 @@
+# services/sharded_uploader.py
+import multiprocessing
+import queue as queue_module
+import time
+
+from config import Settings
+from utils.csv_utils import compute_shards, estimate_csv_rows
+from utils.metrics import Metrics, MetricsExporter
+
+
+def _settings_snapshot():
+    """Atributos de Settings, para reaplicar nos processos filhos (spawn)."""
+    return {name: value for name, value in vars(Settings).items() if name.isupper()}
+
+
+def _split(total, shard_id, count):
+    """Parte do shard num orçamento inteiro dividido entre `count` shards (mínimo 1)."""
+    return max(1, total // count + (1 if shard_id < total % count else 0))
+
+
+class _MetricsForwarder(MetricsExporter):
+    """
+    Exportador dos processos filhos: em vez de gravar arquivos, envia o
+    estado das métricas ao pai, que consolida e grava um único snapshot.
+    """
+
+    def __init__(self, metrics, shard_id, events):
+        super().__init__(metrics)
+        self.shard_id = shard_id
+        self.events = events
+
+    def export(self):
+        self.metrics.snapshot()
+        return self.metrics.export_state(), None
+
+    def write(self, state, _):
+        self.events.put(("metrics", self.shard_id, state))
+
+
+def _run_shard(shard_id, byte_range, options, settings_snapshot, events):
+    """
+    Ponto de entrada de cada processo: aplica as configurações do pai,
+    roda um UploaderService restrito à faixa de bytes do shard e reporta
+    progresso, logs e o resultado final pela fila `events`. O evento "done"
+    leva o motivo da falha (None se o shard concluiu o envio).
+    """
+    for name, value in settings_snapshot.items():
+        setattr(Settings, name, value)
+
+    # Importados aqui para que o processo pai não precise deles
+    from services.uploader_service import UploaderService
+    from services.auth_service import AuthService
+
+    def log(message):
+        events.put(("log", shard_id, message))
+
+    def progress(ok, errors, retries):
+        events.put(("progress", shard_id, ok, errors, retries))
+
+    auth_config = options.pop("auth_config")
+    auth_service = AuthService(logger=log, **auth_config) if auth_config else None
+
+    uploader = None
+    error = "interrompido"
+    started = time.monotonic()
+    try:
+        uploader = UploaderService(
+            byte_range=byte_range,
+            logger=log if options.pop("verbose") else None,
+            on_progress=progress,
+            auth_service=auth_service,
+            **options,
+        )
+        uploader.metrics_exporter = _MetricsForwarder(uploader.metrics, shard_id, events)
+        uploader.start_upload()
+        error = None if uploader.completed else "envio não concluído"
+    except Exception as e:
+        # Reportado ao pai, que decide o resultado do envio
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        if uploader is None:
+            counts, state = (0, 0, 0), Metrics().export_state()
+        else:
+            counts = (uploader.ok_count, uploader.error_count, uploader.retry_count)
+            state = uploader.metrics.export_state()
+        events.put(("done", shard_id, *counts, time.monotonic() - started, state, error))
+
+
+class ShardedUploader:
+    """
+    Divide o CSV em faixas de bytes alinhadas a linhas e envia cada faixa
+    em um processo próprio, com seu event loop, seu pool de conexões e sua
+    parte da concorrência e do limite de taxa. O progresso e o resultado
+    de cada shard são consolidados em um único relatório.
+
+    Supõe que campos entre aspas não contenham quebras de linha.
+    """
+
+    def __init__(self, file_path, auth_token, endpoint_url, delimiter=None, method=None, concurrency=None, logger=None,
+                 processes=None, rate_limit=None, adaptive=None, checkpoint=None, batch_size=None, auth_config=None):
+        """
+        :param processes: Número de processos/shards (padrão: Settings.PROCESSES)
+        :param auth_config: kwargs de AuthService (auth_url, client_id, ...) para
+                            cada processo obter seu próprio token
+        """
+        settings = Settings()
+
+        self.file_path = file_path
+        self.auth_token = auth_token
+        self.endpoint_url = endpoint_url
+        self.delimiter = delimiter or settings.DELIMITER
+        self.method = method or settings.METHOD
+        self.concurrency = concurrency or settings.CONCURRENCY
+        self.logger = logger
+        self.processes = processes or settings.PROCESSES
+        if settings.ORDER_KEY_COLUMNS and self.processes > 1:
+            # Linhas de uma mesma chave podem cair em faixas diferentes do arquivo
+            raise ValueError("A entrega ordenada por chave exige um único processo.")
+        if settings.DEDUP_MODE != "off" and self.processes > 1:
+            # Cada processo teria seu próprio filtro: repetidas em faixas diferentes seriam enviadas
+            raise ValueError("O descarte de linhas repetidas exige um único processo.")
+        self.rate_limit = settings.RATE_LIMIT if rate_limit is None else rate_limit
+        self.adaptive = adaptive
+        self.checkpoint = checkpoint
+        self.batch_size = batch_size
+        self.auth_config = auth_config
+        self.summary_interval = settings.LOG_SUMMARY_INTERVAL
+
+        # Resultado consolidado (mesmos nomes de UploaderService)
+        self.ok_count = 0
+        self.error_count = 0
+        self.retry_count = 0
+        self.shard_results = {}
+        # shard → motivo, para shards que falharam ou não concluíram o envio
+        self.failed_shards = {}
+        self.completed = False
+        # Métricas consolidadas dos shards: só o pai grava os arquivos de métricas
+        self.metrics = Metrics()
+        self.metrics_interval = settings.METRICS_INTERVAL
+        self.metrics_exporter = MetricsExporter(
+            self.metrics, settings.METRICS_JSON_FILE, settings.METRICS_PROMETHEUS_FILE
+        )
+
+    def log(self, message):
+        if self.logger:
+            self.logger(message)
+
+    def _shard_options(self, shard_id, shards):
+        """Parâmetros do UploaderService de um shard, com sua parte do orçamento global."""
+        count = len(shards)
+        return {
+            "file_path": self.file_path,
+            "auth_token": self.auth_token,
+            "endpoint_url": self.endpoint_url,
+            "delimiter": self.delimiter,
+            "method": self.method,
+            "concurrency": _split(self.concurrency, shard_id, count),
+            "rate_limit": self.rate_limit / count if self.rate_limit else 0,
+            "adaptive": self.adaptive,
+            "checkpoint": self.checkpoint,
+            "batch_size": self.batch_size,
+            "auth_config": self.auth_config,
+            "verbose": self.logger is not None,
+        }
+
+    @staticmethod
+    def _shard_settings(snapshot, shard_id, shards):
+        """
+        Configurações de um shard: as do pai, com os tetos globais que o
+        UploaderService lê de Settings (concorrência adaptativa e pool de
+        conexões) divididos entre os shards, como a concorrência.
+        """
+        count = len(shards)
+        settings = dict(snapshot)
+        settings["ADAPTIVE_MAX_CONCURRENCY"] = _split(snapshot["ADAPTIVE_MAX_CONCURRENCY"], shard_id, count)
+        if snapshot["HTTP_POOL_LIMIT"]:
+            settings["HTTP_POOL_LIMIT"] = _split(snapshot["HTTP_POOL_LIMIT"], shard_id, count)
+        return settings
+
+    def start_upload(self):
+        """
+        Executa todos os shards e aguarda o término, consolidando o
+        progresso periodicamente no log.
+        """
+        shards = compute_shards(self.file_path, self.processes)
+        total_estimate = estimate_csv_rows(self.file_path)
+        self.log(f"Iniciando envio de ~{total_estimate} linhas em {len(shards)} processos "
+                 f"(concorrência total {self.concurrency})...")
+
+        # spawn: processos limpos, sem herdar threads/estado do pai (ex.: Tk)
+        context = multiprocessing.get_context("spawn")
+        events = context.Queue()
+        snapshot = _settings_snapshot()
+        workers = {}
+        for shard_id, byte_range in enumerate(shards):
+            process = context.Process(
+                target=_run_shard,
+                args=(shard_id, byte_range, self._shard_options(shard_id, shards),
+                      self._shard_settings(snapshot, shard_id, shards), events),
+                daemon=True,
+            )
+            process.start()
+            workers[shard_id] = process
+
+        progress = {shard_id: (0, 0, 0) for shard_id in workers}
+        # Último estado de métricas de cada shard (cumulativo)
+        states = {}
+        started = last_summary = last_metrics = time.monotonic()
+        last_done = 0
+        try:
+            while len(self.shard_results) < len(workers):
+                try:
+                    event = events.get(timeout=0.2)
+                except queue_module.Empty:
+                    event = None
+                    # Um processo que morreu sem reportar não deve travar o envio
+                    for shard_id, process in workers.items():
+                        if shard_id not in self.shard_results and not process.is_alive():
+                            ok, errors, retries = progress[shard_id]
+                            self.shard_results[shard_id] = (ok, errors, retries, None)
+                            self.failed_shards[shard_id] = f"terminou inesperadamente (código {process.exitcode})"
+                            self.log(f"❌ Shard {shard_id} {self.failed_shards[shard_id]}")
+
+                if event is not None:
+                    kind, shard_id = event[0], event[1]
+                    if kind == "log":
+                        self.log(f"[shard {shard_id}] {event[2]}")
+                    elif kind == "progress":
+                        progress[shard_id] = event[2:5]
+                    elif kind == "metrics":
+                        states[shard_id] = event[2]
+                    elif kind == "done":
+                        progress[shard_id] = event[2:5]
+                        self.shard_results[shard_id] = event[2:6]
+                        states[shard_id] = event[6]
+                        if event[7] is not None:
+                            self.failed_shards[shard_id] = event[7]
+                            self.log(f"❌ Shard {shard_id} falhou: {event[7]}")
+
+                now = time.monotonic()
+                if now - last_summary >= self.summary_interval:
+                    done = sum(ok + errors for ok, errors, _ in progress.values())
+                    rate = (done - last_done) / (now - last_summary)
+                    last_summary, last_done = now, done
+                    self._log_totals(progress, rate, total_estimate)
+                if now - last_metrics >= self.metrics_interval:
+                    last_metrics = now
+                    self._export_metrics(states, progress)
+        finally:
+            for process in workers.values():
+                process.join()
+
+        self.ok_count = sum(result[0] for result in self.shard_results.values())
+        self.error_count = sum(result[1] for result in self.shard_results.values())
+        self.retry_count = sum(result[2] for result in self.shard_results.values())
+        self._export_metrics(states, progress)
+
+        elapsed = time.monotonic() - started
+        for shard_id in sorted(self.shard_results):
+            ok, errors, retries, shard_elapsed = self.shard_results[shard_id]
+            duration = f"{shard_elapsed:.1f}s" if shard_elapsed is not None else "interrompido"
+            if shard_id in self.failed_shards:
+                duration += ", não concluído"
+            self.log(f"  shard {shard_id} {shards[shard_id]}: {ok} OK, {errors} ERRO, {retries} retentativas, {duration}")
+        self.log(f"📊 {self.metrics.format_summary(self.metrics.last_snapshot)}")
+        self.completed = not self.failed_shards
+        if self.completed:
+            self.log(f"Envio concluído! {self.ok_count} OK, {self.error_count} ERRO em {elapsed:.1f}s")
+        else:
+            self.log(f"❌ Envio incompleto: {len(self.failed_shards)} de {len(shards)} processos falharam "
+                     f"({self.ok_count} OK, {self.error_count} ERRO em {elapsed:.1f}s)")
+
+    def _export_metrics(self, states, progress):
+        """Consolida o último estado de cada shard e grava um único snapshot."""
+        self.metrics.load(states.values())
+        self.metrics.counters["rows_ok"] = sum(p[0] for p in progress.values())
+        self.metrics.counters["rows_failed"] = sum(p[1] for p in progress.values())
+        self.metrics_exporter.write(*self.metrics_exporter.export())
+
+    def _log_totals(self, progress, rate, total_estimate):
+        ok = sum(p[0] for p in progress.values())
+        errors = sum(p[1] for p in progress.values())
+        retries = sum(p[2] for p in progress.values())
+        self.log(f"[{ok + errors}/~{total_estimate}] {ok} OK, {errors} ERRO, {retries} retentativas "
+                 f"({rate:.0f} linhas/s, {len(progress)} processos)")
@@ -1,69 +1,829 @@
 # services/uploader_service.py
-import csv
+import os
+import time
 import asyncio
+from collections import deque
 from clients.http_client import HTTPClient
+from clients.retry_policy import RetryPolicy
+from clients.adaptive_limiter import AdaptiveLimiter
+from clients.rate_limiter import RateLimiter
+from clients.circuit_breaker import CircuitBreaker
+from clients.endpoint_balancer import Endpoint, EndpointBalancer, parse_endpoint
 from config import Settings
+from utils.csv_utils import estimate_csv_rows, count_csv_rows
+from utils.csv_reader import CSVRowReader
+from utils.checkpoint import CheckpointJournal
+from services.batching import BatchEncoder
+from services.payload_template import PayloadTemplate
+from utils.metrics import Metrics, MetricsExporter
+from utils.json_path import ResponseExtractor
+from utils.dedup import RowHasher, RowDeduplicator, body_key
+from utils.result_sink import ResultSink
 
 class UploaderService:
     """
     Serviço responsável por orquestrar o envio de linhas do CSV
     com controle de concorrência.
+
+    O CSV é lido em streaming: um leitor alimenta uma fila limitada que é
+    consumida por um número fixo de workers, mantendo a memória constante
+    independentemente do tamanho do arquivo. Falhas retentáveis voltam para
+    a fila após o backoff, sem ocupar um worker enquanto esperam.
     """
 
-    def __init__(self, file_path, auth_token, endpoint_url, delimiter=None, method=None, concurrency=None, logger=None):
+    def __init__(self, file_path, auth_token, endpoint_url, delimiter=None, method=None, concurrency=None, logger=None,
+                 retry_policy=None, adaptive=None, rate_limit=None, auth_service=None, checkpoint=None,
+                 batch_size=None, byte_range=None, on_progress=None, response_fields=None, schema=None,
+                 template=None, dedup=None, idempotency=None, results_file=None, failed_rows_file=None,
+                 order_keys=None, circuit_breaker=None, endpoints=None):
         settings = Settings()
         
-        self.file_path = file_path or settings.default_csv_file
-        self.delimiter = delimiter or settings.default_csv_delimiter
-        self.method = (method or settings.default_method).upper()
+        self.file_path = file_path
+        self.delimiter = delimiter or settings.DELIMITER
+        self.method = (method or settings.METHOD).upper()
         self.endpoint_url = endpoint_url
+        # Vários endpoints equivalentes; se informados, substituem endpoint_url
+        endpoints = settings.ENDPOINTS if endpoints is None else endpoints
+        self.endpoints = [parse_endpoint(endpoint) for endpoint in endpoints or ()]
+        self.balancer = None
         self.auth_token = auth_token
+        self.auth_service = auth_service
         self.logger = logger
-        self.concurrency = concurrency or settings.default_concurrency
+        # Linhas circulam como sequências de valores; o dict só é montado no envio
+        self.reader = CSVRowReader(file_path, self.delimiter, schema)
+        # Corpo de cada linha renderizado direto para bytes (JSON no POST, query string no GET)
+        self.template = PayloadTemplate.from_settings(self.reader.columns, template)
+        if self.method == "GET" and not self.template.supports_query:
+            raise ValueError("Templates aninhados exigem o método POST.")
+
+        # Deduplicação de linhas repetidas e Idempotency-Key derivada do mesmo hash
+        self.dedup_mode = settings.DEDUP_MODE if dedup is None else (dedup or "off")
+        self.idempotency = settings.IDEMPOTENCY_KEY if idempotency is None else idempotency
+        self.row_hasher = None
+        if self.dedup_mode != "off" or self.idempotency:
+            self.row_hasher = RowHasher(self.reader.columns, settings.DEDUP_KEY_COLUMNS)
+        self.deduplicator = None
+        self.duplicate_count = 0
+
+        # Entrega ordenada por chave: linhas com a mesma chave saem em ordem,
+        # uma de cada vez; chaves diferentes seguem em paralelo
+        order_keys = tuple(settings.ORDER_KEY_COLUMNS if order_keys is None else order_keys)
+        missing = [name for name in order_keys if name not in self.reader.columns]
+        if missing:
+            raise ValueError(f"Colunas de ordenação ausentes no CSV: {', '.join(missing)}")
+        self.order_keys = order_keys
+        self.order_key_indexes = tuple(self.reader.columns.index(name) for name in order_keys) or None
+        self.order_max_parked = settings.ORDER_MAX_PARKED
+        self._key_chains = {}
+        self._row_keys = {}
+        self._parked = 0
+        self._parked_space = None
+        self._work_queue = None
+        self.concurrency = concurrency or settings.CONCURRENCY
+        self.adaptive = settings.ADAPTIVE_CONCURRENCY if adaptive is None else adaptive
+        self.limiter = None
+        rate_limit = settings.RATE_LIMIT if rate_limit is None else rate_limit
+        self.rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+        # Disjuntor: pausa o envio enquanto o endpoint estiver fora do ar
+        self.circuit_breaker_enabled = (
+            settings.CIRCUIT_BREAKER_ENABLED if circuit_breaker is None else circuit_breaker
+        )
+        self.breaker = None
+
+        # No modo adaptativo há workers para o teto; o limitador decide quantos enviam
+        self.workers = settings.ADAPTIVE_MAX_CONCURRENCY if self.adaptive else self.concurrency
+        self.limit_per_host = settings.HTTP_POOL_LIMIT_PER_HOST or self.workers
+        # Um teto global menor que o nº de workers deixaria workers esperando conexão
+        self.pool_limit = settings.HTTP_POOL_LIMIT and max(settings.HTTP_POOL_LIMIT, self.workers)
+        self.queue_size = self.workers * settings.QUEUE_SIZE_PER_WORKER
+        self.success_sample = settings.LOG_SUCCESS_SAMPLE
+        self.summary_interval = settings.LOG_SUMMARY_INTERVAL
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.checkpoint = settings.CHECKPOINT_ENABLED if checkpoint is None else checkpoint
+        self.checkpoint_interval = settings.CHECKPOINT_INTERVAL
+        self.journal = None
+
+        # Faixa de bytes (início, fim) do CSV a enviar; None = arquivo inteiro
+        self.byte_range = byte_range
+        # Se informado, recebe (ok, erro, retentativas) no lugar do resumo periódico no log
+        self.on_progress = on_progress
+
+        # Campos extraídos da resposta de cada linha (ex.: {"id": "$.id"})
+        self.response_extractor = ResponseExtractor(
+            settings.RESPONSE_FIELDS if response_fields is None else response_fields
+        )
+
+        # Resultado por linha e CSV de falhas (um par de arquivos por faixa no modo em processos)
+        self.results_file = self._scoped_path(settings.RESULTS_FILE if results_file is None else results_file)
+        self.failed_rows_file = self._scoped_path(
+            settings.FAILED_ROWS_FILE if failed_rows_file is None else failed_rows_file
+        )
+        self.result_sink = None
+        # Linha bruta (antes do schema) das linhas em andamento, para o CSV de falhas
+        self._raw_rows = {}
+
+        # Métricas do envio; last_snapshot pode ser lido por outras threads (GUI)
+        self.metrics = Metrics()
+        self.metrics_interval = settings.METRICS_INTERVAL
+        self.metrics_exporter = MetricsExporter(
+            self.metrics, settings.METRICS_JSON_FILE, settings.METRICS_PROMETHEUS_FILE
+        )
+
+        # Envio em lote (batch_size > 1)
+        self.batch_size = batch_size or settings.BATCH_SIZE
+        self.batch_max_bytes = settings.BATCH_MAX_BYTES
+        self.batch_linger = settings.BATCH_LINGER
+        self.batch_split = settings.BATCH_SPLIT_ON_FAILURE
+        self.batch_encoder = BatchEncoder() if self.batch_size > 1 else None
+        if self.batch_encoder is not None and self.method != "POST":
+            raise ValueError("O envio em lote só é suportado com o método POST.")
+        if self.order_key_indexes is not None and self.batch_encoder is not None:
+            raise ValueError("A entrega ordenada por chave não é suportada no envio em lote.")
+        if self.response_extractor and self.batch_encoder is not None:
+            # A resposta de um lote não tem formato definido para mapear de volta a cada linha
+            raise ValueError("Campos da resposta (RESPONSE_FIELDS) não são suportados no envio em lote.")
+
+        # Contadores do envio, usados nos resumos periódicos
+        self.ok_count = 0
+        self.error_count = 0
+        self.retry_count = 0
+        # True quando o envio percorreu o arquivo todo (não foi cancelado antes, ex.: sem token)
+        self.completed = False
+        self._last_summary = 0.0
+        self._last_summary_done = 0
+
+        # Linhas lidas e ainda não finalizadas (incluindo as aguardando retry)
+        self._outstanding = 0
+        self._aborted = False
+        self._reading_done = False
+        self._drained = None
+        self._retry_tasks = set()
+        self._undelivered = 0
 
-    async def _send_row(self, session, row, semaphore, idx, total):
+        # Total de linhas: estimado no início, exato quando a contagem terminar
+        self.total = None
+        self.total_estimate = None
+
+    def _scoped_path(self, path):
+        """Acrescenta a faixa de bytes ao nome do arquivo quando o envio cobre só uma parte do CSV."""
+        if not path or self.byte_range is None:
+            return path
+        root, ext = os.path.splitext(path)
+        return "{}.{}-{}{}".format(root, *self.byte_range, ext)
+
+    @property
+    def current_concurrency(self):
+        """Concorrência em uso: o limite dinâmico no modo adaptativo, ou o fixo."""
+        if self.limiter is not None:
+            return self.limiter.limit
+        return self.concurrency
+
+    def _progress(self, idx):
         """
-        Envia uma linha do CSV respeitando o limite de concorrência.
+        Formata o progresso como 'idx/total', usando a estimativa
+        (prefixada com '~') enquanto a contagem exata não termina.
         """
-        async with semaphore:
-            try:
-                response, text = await HTTPClient.send_request(
+        if self.total is not None:
+            return f"{idx}/{self.total}"
+        return f"{idx}/~{self.total_estimate}"
+
+    def _log_summary(self, idx, force=False):
+        """
+        Loga um resumo agregado do progresso no máximo uma vez por
+        summary_interval, em vez de uma linha por requisição bem-sucedida.
+        """
+        if not self.logger and not self.on_progress:
+            return
+        now = time.monotonic()
+        elapsed = now - self._last_summary
+        if not force and elapsed < self.summary_interval:
+            return
+        done = self.ok_count + self.error_count
+        rate = (done - self._last_summary_done) / elapsed if elapsed > 0 else 0.0
+        self._last_summary = now
+        self._last_summary_done = done
+        if self.on_progress:
+            self.on_progress(self.ok_count, self.error_count, self.retry_count)
+            return
+        eta = ""
+        total = self.total if self.total is not None else self.total_estimate
+        if not force and rate > 0 and total and total > done:
+            eta = f", ETA {self._format_duration((total - done) / rate)}"
+        self.logger(
+            f"[{self._progress(idx)}] {self.ok_count} OK, {self.error_count} ERRO, "
+            f"{self.retry_count} retentativas ({rate:.0f} linhas/s, concorrência {self.current_concurrency}{eta})"
+        )
+
+    @staticmethod
+    def _format_duration(seconds):
+        seconds = int(seconds)
+        hours, rest = divmod(seconds, 3600)
+        minutes, seconds = divmod(rest, 60)
+        return f"{hours}h{minutes:02d}m{seconds:02d}s" if hours else f"{minutes}m{seconds:02d}s"
+
+    async def _count_rows(self):
+        """
+        Conta as linhas do arquivo em uma thread, sem bloquear o envio.
+        """
+        try:
+            self.total = await asyncio.to_thread(count_csv_rows, self.file_path)
+        except OSError:
+            pass
+
+    def _finish_row(self, idx, offset=None, delivered=False):
+        """
+        Marca uma linha como finalizada (sucesso ou falha definitiva).
+        Linhas entregues (ou rejeitadas de forma definitiva pela API) vão
+        para o journal de checkpoint e não são reenviadas numa retomada.
+        """
+        if self.journal is not None:
+            if delivered:
+                self.journal.mark_done(idx, offset)
+            else:
+                self._undelivered += 1
+        if self.order_key_indexes is not None:
+            self._release_key(idx)
+        if self._raw_rows:
+            self._raw_rows.pop(idx, None)
+        self._outstanding -= 1
+        if self._reading_done and self._outstanding == 0:
+            self._drained.set()
+        self._log_summary(idx)
+
+    async def _dispatch(self, queue, item):
+        """
+        Coloca uma linha lida na fila de envio. No modo ordenado, se já há
+        uma linha da mesma chave em andamento, a nova aguarda fora da fila
+        (sem ocupar vaga nem worker) até a anterior ser finalizada.
+        """
+        if self.order_key_indexes is None:
+            await queue.put(item)
+            return
+        idx, values = item[0], item[1]
+        size = len(values)
+        key = tuple(values[i] if i < size else None for i in self.order_key_indexes)
+        self._row_keys[idx] = key
+        chain = self._key_chains.get(key)
+        if chain is None:
+            self._key_chains[key] = deque()
+            await queue.put(item)
+            return
+        chain.append(item)
+        self._parked += 1
+        if self._parked >= self.order_max_parked:
+            # Limita a memória das linhas em espera (ex.: uma chave muito frequente)
+            self._parked_space.clear()
+            await self._parked_space.wait()
+
+    def _release_key(self, idx):
+        """Libera a próxima linha da mesma chave, se houver, após finalizar `idx`."""
+        key = self._row_keys.pop(idx, None)
+        if key is None:
+            return
+        chain = self._key_chains[key]
+        if not chain:
+            del self._key_chains[key]
+            return
+        self._parked -= 1
+        if self._parked < self.order_max_parked:
+            self._parked_space.set()
+        self._requeue(self._work_queue, chain.popleft())
+
+    def _requeue(self, queue, item, delay=0):
+        """
+        Devolve um item à fila após `delay` segundos em uma task própria,
+        liberando o worker para outras linhas durante a espera.
+        """
+        async def requeue():
+            await asyncio.sleep(delay)
+            await queue.put(item)
+
+        task = asyncio.create_task(requeue())
+        self._retry_tasks.add(task)
+        task.add_done_callback(self._retry_tasks.discard)
+
+    def _schedule_retry(self, queue, item, delay):
+        self.retry_count += 1
+        self.metrics.inc("retries")
+        self._requeue(queue, item, delay)
+
+    async def _request(self, client, data=None, body=None, content_type=None, idempotency_key=None, url=None):
+        """
+        Envia a requisição com o token atual. Se houver AuthService e a
+        resposta for 401, aguarda a renovação compartilhada e reenvia.
+        """
+        url = url or self.endpoint_url
+        auth = self.auth_service
+        token = await auth.get_token_async() if auth is not None else self.auth_token
+        response, text = await client.send_request(
+            method=self.method,
+            url=url,
+            data=data,
+            token=token,
+            body=body,
+            content_type=content_type,
+            idempotency_key=idempotency_key,
+        )
+        if response.status == 401 and auth is not None:
+            new_token = await auth.handle_unauthorized(token)
+            if new_token and new_token != token:
+                response, text = await client.send_request(
                     method=self.method,
-                    url=self.endpoint_url,
-                    data=row,
-                    token=self.auth_token,
+                    url=url,
+                    data=data,
+                    token=new_token,
+                    body=body,
+                    content_type=content_type,
+                    idempotency_key=idempotency_key,
                 )
+        return response, text
+
+    async def _attempt(self, client, data=None, body=None, content_type=None, idempotency_key=None):
+        """
+        Faz uma tentativa de envio respeitando o limite de taxa e de
+        concorrência. Retorna (response, texto, None, latência) ou
+        (None, None, exceção, latência).
+        """
+        limiter = self.limiter
+        breaker = self.breaker
+        # Com o circuito aberto, a linha espera aqui (sem tentativa gasta)
+        probe = await breaker.acquire() if breaker is not None else False
+        # Espera pela taxa antes de ocupar uma vaga de concorrência
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+        if limiter is not None:
+            await limiter.acquire()
+        # Com vários endpoints, cada requisição vai para o melhor disponível, no pool dele
+        endpoint = await self.balancer.acquire() if self.balancer is not None else None
+        url = None
+        if endpoint is not None:
+            client, url = endpoint.client, endpoint.url
+        started = time.monotonic()
+        try:
+            response, text = await self._request(client, data, body, content_type, idempotency_key, url)
+        except Exception as e:
+            if endpoint is not None:
+                self.balancer.release(endpoint, time.monotonic() - started, exception=e)
+            if limiter is not None:
+                limiter.release(overload=isinstance(e, asyncio.TimeoutError))
+            if breaker is not None:
+                breaker.record(False, probe)
+            return None, None, e, time.monotonic() - started
+
+        latency = time.monotonic() - started
+        if endpoint is not None:
+            self.balancer.release(endpoint, latency, response.status)
+        if self.rate_limiter is not None:
+            self.rate_limiter.update_from_headers(response.headers)
+        if limiter is not None:
+            limiter.release(latency, limiter.is_overload_status(response.status))
+        if breaker is not None:
+            breaker.record(not breaker.is_failure_status(response.status), probe)
+        return response, text, None, latency
+
+    async def _record_result(self, idx, attempt, latency, status=None, error=None, text=None, failed_values=None):
+        """Envia o resultado final de uma linha ao ResultSink, se houver."""
+        sink = self.result_sink
+        if not sink:
+            return
+        fields = None
+        if text and sink.response_fields:
+            fields = self.response_extractor.extract_text(text)
+        if error is not None:
+            error = type(error).__name__
+        elif status is not None and status >= 400:
+            error = f"HTTP {status // 100}xx"
+        if failed_values is not None:
+            failed_values = self._raw_rows.get(idx, failed_values)
+        await sink.record(idx, status, latency, attempt, error, fields, failed_values)
+
+    async def _send_row(self, client, queue, idx, values, attempt, offset):
+        """
+        Envia uma linha do CSV. Em falha retentável, agenda nova tentativa;
+        caso contrário, contabiliza o resultado e finaliza a linha.
+        """
+        policy = self.retry_policy
+        if self.method == "GET":
+            body = self.template.render_query(values)
+        else:
+            body = self.template.render(values)
+        key = self.row_hasher.key(values) if self.idempotency else None
+        response, text, error, latency = await self._attempt(client, body=body, content_type="application/json",
+                                                             idempotency_key=key)
+        if error is not None:
+            if policy.should_retry(attempt, exception=error):
+                self._schedule_retry(queue, (idx, values, attempt + 1, offset), policy.compute_delay(attempt))
+                return
+            self.error_count += 1
+            if self.logger:
+                self.logger(f"[{self._progress(idx)}] ERRO → {self.reader.to_dict(values)} → {error}")
+            await self._record_result(idx, attempt, latency, error=error, failed_values=values)
+            self._finish_row(idx, offset)
+            return
+
+        status = response.status
+        if status >= 400:
+            if policy.should_retry(attempt, status=status):
+                delay = policy.compute_delay(attempt, response.headers)
+                self._schedule_retry(queue, (idx, values, attempt + 1, offset), delay)
+                return
+            self.error_count += 1
+            if self.logger:
+                self.logger(f"[{self._progress(idx)}] ERRO → {self.reader.to_dict(values)} → Status {status} (tentativa {attempt})")
+            await self._record_result(idx, attempt, latency, status, text=text, failed_values=values)
+            # Rejeição definitiva (ex.: 400/422) não melhora com reenvio
+            self._finish_row(idx, offset, delivered=status not in policy.retry_statuses)
+        else:
+            self.ok_count += 1
+            if self.logger and self.success_sample and self.ok_count % self.success_sample == 0:
+                fields = f" → {self.response_extractor.extract_text(text)}" if self.response_extractor else ""
+                self.logger(f"[{self._progress(idx)}] OK → {self.reader.to_dict(values)} → Status {status}{fields}")
+            await self._record_result(idx, attempt, latency, status, text=text)
+            self._finish_row(idx, offset, delivered=True)
+
+    async def _send_batch(self, client, queue, entries, attempt):
+        """
+        Envia um lote de linhas (entries: [(idx, valores, offset, json)]) em uma
+        única requisição. O resultado do lote vale para cada uma das linhas.
+        Um lote rejeitado de forma definitiva é dividido ao meio e reenviado,
+        isolando a linha inválida sem perder as demais.
+        """
+        policy = self.retry_policy
+        encoder = self.batch_encoder
+        body = encoder.encode_batch([entry[3] for entry in entries])
+        first, last = entries[0][0], entries[-1][0]
+
+        key = body_key(body) if self.idempotency else None
+        response, text, error, latency = await self._attempt(client, body=body, content_type=encoder.content_type,
+                                                             idempotency_key=key)
+        if error is not None:
+            if policy.should_retry(attempt, exception=error):
+                self._schedule_retry(queue, (entries, attempt + 1), policy.compute_delay(attempt))
+                return
+            reason, delivered, status = error, False, None
+        else:
+            status = response.status
+            if status < 400:
+                self.ok_count += len(entries)
+                if self.logger and self.success_sample and self.ok_count % self.success_sample < len(entries):
+                    self.logger(f"[{self._progress(last)}] OK → lote {first}-{last} ({len(entries)} linhas) → Status {status}")
+                for idx, _, offset, _ in entries:
+                    await self._record_result(idx, attempt, latency, status)
+                    self._finish_row(idx, offset, delivered=True)
+                return
+            if policy.should_retry(attempt, status=status):
+                self._schedule_retry(queue, (entries, attempt + 1), policy.compute_delay(attempt, response.headers))
+                return
+            if self.batch_split and len(entries) > 1:
+                middle = len(entries) // 2
                 if self.logger:
-                    self.logger(f"[{idx}/{total}] OK → {row} → Status {response.status}")
-            except Exception as e:
-                if self.logger:
-                    self.logger(f"[{idx}/{total}] ERRO → {row} → {e}")
+                    self.logger(f"[{self._progress(last)}] Lote {first}-{last} rejeitado (Status {status}), dividindo...")
+                self.metrics.inc("batch_splits")
+                self._requeue(queue, (entries[:middle], 1))
+                self._requeue(queue, (entries[middle:], 1))
+                return
+            reason, delivered = f"Status {status}", status not in policy.retry_statuses
 
-    async def upload_all(self):
+        self.error_count += len(entries)
+        if self.logger:
+            rows = self.reader.to_dict(entries[0][1]) if len(entries) == 1 else f"lote {first}-{last} ({len(entries)} linhas)"
+            self.logger(f"[{self._progress(last)}] ERRO → {rows} → {reason} (tentativa {attempt})")
+        for idx, values, offset, _ in entries:
+            await self._record_result(idx, attempt, latency, status, error=error, failed_values=values)
+            self._finish_row(idx, offset, delivered=delivered)
+
+    async def _batch_rows(self, rows_queue, queue):
         """
-        Lê o CSV e envia todas as linhas de forma assíncrona,
-        respeitando o limite de concorrência.
+        Estágio de lotes: agrupa as linhas lidas em lotes limitados por
+        quantidade e bytes. Um lote parcial é enviado se nenhuma linha nova
+        chegar em `batch_linger` segundos.
+        """
+        encoder = self.batch_encoder
+        entries, size = [], 0
+
+        async def flush():
+            nonlocal entries, size
+            if entries:
+                await queue.put((entries, 1))
+                entries, size = [], 0
+
+        while True:
+            try:
+                item = rows_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                if not entries:
+                    item = await rows_queue.get()
+                else:
+                    try:
+                        item = await asyncio.wait_for(rows_queue.get(), self.batch_linger)
+                    except asyncio.TimeoutError:
+                        await flush()
+                        continue
+            if item is None:
+                break
+
+            idx, values, _, offset = item
+            piece = self.template.render(values)
+            if entries and size + len(piece) + encoder.overhead(len(entries) + 1) > self.batch_max_bytes:
+                await flush()
+            entries.append((idx, values, offset, piece))
+            size += len(piece)
+            if len(entries) >= self.batch_size:
+                await flush()
+        await flush()
+
+    async def _read_rows(self, queue):
+        """
+        Estágio leitor: percorre o CSV linha a linha e alimenta a fila.
+        Bloqueia quando a fila está cheia, limitando a memória usada.
+        Com checkpoint, começa no offset salvo e pula linhas já entregues.
+        """
+        dedup = self.deduplicator
+        self._work_queue = queue
+        # O CSV de falhas repete a linha como estava no arquivo, não a convertida pelo schema
+        keep_raw = self.result_sink is not None and self.result_sink.failed_path is not None
+        raw_rows = self._raw_rows
+        if self.journal is None and self.byte_range is None:
+            rows = self.reader.iter_with_raw() if keep_raw else ((values, None) for values in self.reader)
+            for idx, (values, raw) in enumerate(rows, start=1):
+                if dedup is not None and dedup.is_duplicate(values):
+                    continue
+                if raw is not None and raw is not values:
+                    raw_rows[idx] = raw
+                self._outstanding += 1
+                await self._dispatch(queue, (idx, values, 1, None))
+            return
+
+        start, end = self.byte_range or (None, None)
+        last_done, offset = self.journal.resume_point if self.journal is not None else (0, None)
+        rows = self.reader.iter_with_offsets(offset or start, end, with_raw=keep_raw)
+        for idx, (values, end_offset, *raw) in enumerate(rows, start=last_done + 1):
+            if self.journal is not None and self.journal.is_done(idx):
+                continue
+            if dedup is not None and dedup.is_duplicate(values):
+                # Conta como concluída para o checkpoint avançar
+                if self.journal is not None:
+                    self.journal.mark_done(idx, end_offset)
+                continue
+            if raw and raw[0] is not values:
+                raw_rows[idx] = raw[0]
+            self._outstanding += 1
+            await self._dispatch(queue, (idx, values, 1, end_offset))
+
+    def _export_metrics(self):
+        """Atualiza o snapshot das métricas e devolve o que deve ser gravado."""
+        counters = self.metrics.counters
+        counters["rows_ok"] = self.ok_count
+        counters["rows_failed"] = self.error_count
+        if self.deduplicator is not None:
+            counters["rows_duplicate"] = self.deduplicator.duplicates
+        if self.limiter is not None:
+            counters["concurrency_limit"] = self.limiter.limit
+        if self.breaker is not None:
+            counters["circuit_open"] = 0 if self.breaker.state == CircuitBreaker.CLOSED else 1
+        return self.metrics_exporter.export()
+
+    async def _metrics_loop(self):
+        """Gera snapshots periódicos das métricas e os exporta fora do event loop."""
+        while True:
+            await asyncio.sleep(self.metrics_interval)
+            await asyncio.to_thread(self.metrics_exporter.write, *self._export_metrics())
+
+    async def _checkpoint_loop(self):
         """
-        tasks = []
-        semaphore = asyncio.Semaphore(self.concurrency)
+        Grava o journal periodicamente, fora do event loop. Agrupar as
+        gravações (e os fsyncs) mantém o custo independente da vazão.
+        """
+        while True:
+            await asyncio.sleep(self.checkpoint_interval)
+            await asyncio.to_thread(self.journal.write, self.journal.snapshot())
 
-        with open(self.file_path, newline="", encoding="utf-8") as csvfile:
-            reader = csv.DictReader(csvfile, delimiter=self.delimiter)
-            rows = list(reader)
+    async def _close_checkpoint(self):
+        """
+        Grava o estado final do journal, ou o remove se todas as linhas
+        foram entregues.
+        """
+        if self._reading_done and self._outstanding == 0 and self._undelivered == 0:
+            await asyncio.to_thread(self.journal.remove)
+            return
+        await asyncio.to_thread(self.journal.write, self.journal.snapshot())
+        if self.logger:
+            self.logger(f"💾 Progresso salvo em {self.journal.path}; execute novamente para retomar.")
+
+    def _abort_on_error(self, task, main):
+        """Cancela o envio (uma única vez) quando um worker termina com erro."""
+        if task.cancelled() or task.exception() is None or self._aborted:
+            return
+        self._aborted = True
+        main.cancel()
+
+    @staticmethod
+    def _worker_error(workers):
+        """Primeira exceção entre os workers já encerrados, se houver."""
+        for task in workers:
+            if task.done() and not task.cancelled() and task.exception() is not None:
+                return task.exception()
+        return None
 
-        total = len(rows)
+    async def _worker(self, client, queue):
+        """
+        Estágio de envio: consome a fila até receber o sentinela None.
+        """
+        while True:
+            item = await queue.get()
+            try:
+                if item is None:
+                    return
+                if self.batch_encoder is not None:
+                    await self._send_batch(client, queue, *item)
+                else:
+                    await self._send_row(client, queue, *item)
+            finally:
+                queue.task_done()
+
+    async def upload_all(self):
+        """
+        Lê o CSV em streaming e envia as linhas de forma assíncrona,
+        respeitando o limite de concorrência.
+        """
+        self.total = None
+        self.completed = False
+        self.total_estimate = estimate_csv_rows(self.file_path)
+        if self.byte_range is not None:
+            # Estimativa proporcional à faixa; a contagem exata só vale para o arquivo inteiro
+            size = os.path.getsize(self.file_path) or 1
+            start, end = self.byte_range
+            self.total_estimate = int(self.total_estimate * (end - start) / size)
+        self.ok_count = 0
+        self.error_count = 0
+        self.retry_count = 0
+        self.deduplicator = RowDeduplicator(self.row_hasher, self.dedup_mode) if self.dedup_mode != "off" else None
+        self._outstanding = 0
+        self._aborted = False
+        self._reading_done = False
+        self._drained = asyncio.Event()
+        self._key_chains = {}
+        self._row_keys = {}
+        self._parked = 0
+        self._parked_space = asyncio.Event()
+        self._raw_rows = {}
+        self._undelivered = 0
+        self._last_summary = time.monotonic()
+        if self.adaptive:
+            self.limiter = AdaptiveLimiter(
+                initial=self.concurrency,
+                max_limit=self.workers,
+                logger=self.logger,
+            )
+        self._last_summary_done = 0
         if self.logger:
-            self.logger(f"Iniciando envio de {total} linhas com concorrência {self.concurrency}...")
+            mode = f" adaptativa (até {self.workers})" if self.adaptive else ""
+            if self.rate_limiter is not None:
+                mode += f" e limite de {self.rate_limiter.rate:g} req/s"
+            if self.endpoints:
+                mode += f", entre {len(self.endpoints)} endpoints"
+            if self.order_key_indexes is not None:
+                mode += f", em ordem por {', '.join(self.order_keys)}"
+            if self.deduplicator is not None:
+                mode += f", descartando linhas repetidas ({self.dedup_mode})"
+            if self.batch_encoder is not None:
+                mode += f", em lotes de até {self.batch_size} linhas ({self.batch_encoder.batch_format})"
+            self.logger(f"Iniciando envio de ~{self.total_estimate} linhas com concorrência {self.concurrency}{mode}...")
 
-        import aiohttp
-        async with aiohttp.ClientSession() as session:
-            for idx, row in enumerate(rows, start=1):
-                tasks.append(
-                    self._send_row(session, row, semaphore, idx, total)
+        resumed = False
+        if self.checkpoint:
+            scope = "{}-{}".format(*self.byte_range) if self.byte_range else None
+            self.journal = await asyncio.to_thread(CheckpointJournal, self.file_path, self.delimiter, None, scope)
+            resumed = await asyncio.to_thread(self.journal.load)
+            if resumed and self.logger:
+                last_done, offset = self.journal.resume_point
+                self.logger(
+                    f"⏩ Retomando envio: {self.journal.delivered} linhas já entregues, "
+                    f"continuando a partir da linha {last_done + 1} (byte {offset or 0})"
                 )
-            await asyncio.gather(*tasks)
 
+        # Abre os arquivos de resultado antes do envio: caminho inválido falha já aqui.
+        # Numa retomada, continua os arquivos da execução anterior em vez de sobrescrevê-los.
+        self.result_sink = ResultSink(
+            self.results_file,
+            self.response_extractor.fields,
+            self.failed_rows_file,
+            self.reader.header,
+            self.delimiter,
+            append=resumed,
+        )
+        await asyncio.to_thread(self.result_sink.start)
+
+        checkpoint_task = asyncio.create_task(self._checkpoint_loop()) if self.checkpoint else None
+
+        self.metrics = self.metrics_exporter.metrics = Metrics()
+        metrics_task = asyncio.create_task(self._metrics_loop())
+        if self.circuit_breaker_enabled:
+            self.breaker = CircuitBreaker(logger=self.logger, metrics=self.metrics)
+        if self.endpoints:
+            self.balancer = EndpointBalancer(
+                [Endpoint(endpoint.url, endpoint.weight) for endpoint in self.endpoints],
+                self.workers,
+                logger=self.logger,
+                metrics=self.metrics,
+            )
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        count_task = asyncio.create_task(self._count_rows()) if self.byte_range is None else None
+
+        try:
+            # Um único pool de conexões para todo o envio
+            async with HTTPClient(limit=self.pool_limit, limit_per_host=self.limit_per_host, metrics=self.metrics) as client:
+                auth = self.auth_service
+                if auth is not None:
+                    # Autenticação no mesmo pool de conexões do envio
+                    auth.bind_client(client)
+                    if not await auth.get_token_async():
+                        auth.bind_client(None)
+                        if self.logger:
+                            self.logger("❌ Não foi possível obter o token; envio cancelado.")
+                        return
+                if self.balancer is not None:
+                    # Um pool de conexões por endpoint, todos no mesmo ErrorSink
+                    for endpoint in self.balancer.endpoints:
+                        endpoint.client = HTTPClient(
+                            limit=self.pool_limit,
+                            limit_per_host=self.limit_per_host,
+                            error_sink=client.error_sink,
+                            metrics=self.metrics,
+                        )
+                workers = [
+                    asyncio.create_task(self._worker(client, queue))
+                    for _ in range(self.workers)
+                ]
+                # Um worker que falha (ex.: erro ao gravar resultados) interrompe o envio
+                main = asyncio.current_task()
+                for task in workers:
+                    task.add_done_callback(lambda task: self._abort_on_error(task, main))
+                error = None
+                try:
+                    if self.batch_encoder is not None:
+                        rows_queue = asyncio.Queue(maxsize=self.queue_size * self.batch_size)
+                        batcher = asyncio.create_task(self._batch_rows(rows_queue, queue))
+                        try:
+                            await self._read_rows(rows_queue)
+                        finally:
+                            if self._worker_error(workers) is None:
+                                await rows_queue.put(None)
+                                await batcher
+                            else:
+                                batcher.cancel()
+                    else:
+                        await self._read_rows(queue)
+                    self._reading_done = True
+                    if self._outstanding == 0:
+                        self._drained.set()
+                    # Aguarda todas as linhas, inclusive as que estão em retry
+                    await self._drained.wait()
+                finally:
+                    for task in list(self._retry_tasks):
+                        task.cancel()
+                    error = self._worker_error(workers)
+                    if error is None:
+                        # Um sentinela por worker encerra o pool após o fim da fila
+                        for _ in workers:
+                            await queue.put(None)
+                        await asyncio.gather(*workers)
+                    else:
+                        # Ninguém mais consome a fila: encerra os workers restantes
+                        for task in workers:
+                            task.cancel()
+                        await asyncio.gather(*workers, return_exceptions=True)
+                    if self.balancer is not None:
+                        await asyncio.gather(*(endpoint.client.close() for endpoint in self.balancer.endpoints))
+                    if auth is not None:
+                        auth.bind_client(None)
+                    if error is not None:
+                        raise error
+        finally:
+            if count_task is not None and not count_task.done():
+                count_task.cancel()
+            metrics_task.cancel()
+            await asyncio.to_thread(self.metrics_exporter.write, *self._export_metrics())
+            await asyncio.to_thread(self.result_sink.close)
+            # Mesmo se o envio for interrompido, o progresso fica salvo
+            if checkpoint_task is not None:
+                checkpoint_task.cancel()
+                await self._close_checkpoint()
+
+        self.completed = True
+        if self.deduplicator is not None:
+            self.duplicate_count = self.deduplicator.duplicates
         if self.logger:
+            self._log_summary(self.ok_count + self.error_count, force=True)
+            if self.duplicate_count:
+                self.logger(f"♻️ {self.duplicate_count} linhas repetidas descartadas")
+            self.logger(f"📊 {self.metrics.format_summary(self.metrics.last_snapshot)}")
+            if self.balancer is not None:
+                self.logger(f"🌐 {self.balancer.format_summary()}")
+            if self.result_sink.written:
+                self.logger(f"📝 Resultado de {self.result_sink.written} linhas em {self.results_file}")
+            if self.result_sink.failed:
+                self.logger(f"🔁 {self.result_sink.failed} linhas com falha em {self.failed_rows_file} (pronto para reenvio)")
             self.logger("Envio concluído!")
 
     def start_upload(self):
@@ -0,0 +1,65 @@
+# tests/conftest.py
+import inspect
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clients.http_client import HTTPClient  # noqa: E402
+
+
+class FakeResponse:
+    def __init__(self, status):
+        self.status = status
+        self.reason = "OK" if status < 400 else "Erro"
+        self.headers = {}
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    """logs/ e checkpoints/ são relativos ao diretório atual: isola cada teste."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def write_csv(tmp_path):
+    """Grava um CSV de teste e devolve o caminho."""
+    def write(rows, header=("id", "name"), name="data.csv"):
+        path = tmp_path / name
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(",".join(header) + "\n")
+            for row in rows:
+                f.write(",".join(str(value) for value in row) + "\n")
+        return str(path)
+    return write
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    """
+    Substitui HTTPClient.send_request por uma API em memória. `handler`
+    recebe o corpo decodificado (dict, ou lista num lote) e devolve o
+    status HTTP, direto ou por uma corrotina.
+    """
+    class FakeApi:
+        def __init__(self):
+            self.handler = lambda payload: 200
+            self.requests = []
+
+    api = FakeApi()
+
+    async def send_request(client, method, url, data=None, token=None, body=None, content_type=None,
+                           idempotency_key=None):
+        payload = json.loads(body) if body is not None else data
+        api.requests.append(payload)
+        status = api.handler(payload)
+        if inspect.isawaitable(status):
+            status = await status
+        return FakeResponse(status), "{}"
+
+    monkeypatch.setattr(HTTPClient, "send_request", send_request)
+    return api
@@ -0,0 +1,100 @@
+# tests/test_auth_service.py
+import asyncio
+import json
+
+from services.auth_service import AuthService
+
+
+class FakeAuthClient:
+    """Cliente vinculado ao AuthService: responde à requisição de token."""
+
+    def __init__(self, expires_in=3600, fail_after=None):
+        self.expires_in = expires_in
+        self.fail_after = fail_after
+        self.calls = 0
+
+    async def fetch(self, method, url, form=None, timeout=None):
+        self.calls += 1
+        await asyncio.sleep(0.001)
+        if self.fail_after is not None and self.calls > self.fail_after:
+            return 503, ""
+        return 200, json.dumps({"access_token": f"token{self.calls}", "expires_in": self.expires_in})
+
+
+def _auth(client):
+    auth = AuthService("http://auth.local/token", "id", "secret", logger=lambda message: None)
+    auth.bind_client(client)
+    return auth
+
+
+async def _hammer(auth, seconds):
+    """Simula workers pedindo o token a cada requisição."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + seconds
+    while loop.time() < deadline:
+        assert await auth.get_token_async()
+        await asyncio.sleep(0.001)
+
+
+def test_concurrent_requests_share_a_single_refresh():
+    client = FakeAuthClient()
+    auth = _auth(client)
+
+    async def run():
+        return await asyncio.gather(*(auth.get_token_async() for _ in range(50)))
+
+    assert set(asyncio.run(run())) == {"token1"}
+    assert client.calls == 1
+
+
+def test_unauthorized_refreshes_once_for_the_rejected_token():
+    client = FakeAuthClient()
+    auth = _auth(client)
+
+    async def run():
+        rejected = await auth.get_token_async()
+        return await asyncio.gather(*(auth.handle_unauthorized(rejected) for _ in range(20)))
+
+    assert set(asyncio.run(run())) == {"token2"}
+    assert client.calls == 2
+
+
+def test_short_lived_token_does_not_refresh_on_every_request():
+    # Validade (30s) menor que a margem padrão (60s)
+    client = FakeAuthClient(expires_in=30)
+    auth = _auth(client)
+    asyncio.run(_hammer(auth, 0.5))
+    assert client.calls == 1
+
+
+def test_refresh_starts_inside_the_clamped_margin():
+    client = FakeAuthClient(expires_in=30)
+    auth = _auth(client)
+
+    async def run():
+        await auth.get_token_async()
+        # Faltando 10s (menos que metade da validade): renova em background
+        auth._cached_token.expires_at -= 20
+        token = await auth.get_token_async()
+        await asyncio.sleep(0.01)
+        return token
+
+    assert asyncio.run(run()) == "token1"
+    assert client.calls == 2
+    assert auth._cached_token.value == "token2"
+
+
+def test_failed_background_refresh_backs_off():
+    client = FakeAuthClient(expires_in=30, fail_after=1)
+    auth = _auth(client)
+    auth.refresh_backoff = 0.2
+
+    async def run():
+        await auth.get_token_async()
+        auth._cached_token.expires_at -= 20
+        await _hammer(auth, 0.5)
+
+    asyncio.run(run())
+    # Tentativas em t≈0 e t≈0.2; com o backoff dobrando, a próxima só em t≈0.6
+    assert 2 <= client.calls - 1 <= 3
+    assert auth._refresh_failures >= 2
@@ -0,0 +1,22 @@
+# tests/test_metrics.py
+from utils.metrics import Metrics
+
+
+def _shard_state(requests):
+    metrics = Metrics()
+    for _ in range(requests):
+        metrics.request_started(10)
+        metrics.request_finished(0.01, status=200, bytes_received=5)
+    return metrics.export_state()
+
+
+def test_load_replaces_totals_with_the_latest_shard_states():
+    merged = Metrics()
+    merged.load([_shard_state(3), _shard_state(2)])
+    # Estados cumulativos mais recentes: não soma com a consolidação anterior
+    merged.load([_shard_state(5), _shard_state(4)])
+
+    snapshot = merged.snapshot()
+    assert snapshot["requests"] == 9
+    assert snapshot["statuses"] == {"200": 9}
+    assert snapshot["bytes_sent"] == 90
@@ -0,0 +1,43 @@
+# tests/test_sharded_uploader.py
+import pytest
+
+from config import Settings
+from services.sharded_uploader import ShardedUploader
+
+
+def test_failed_shards_make_the_run_incomplete(write_csv, monkeypatch):
+    path = write_csv([(i, f"nome{i}") for i in range(20)])
+    # Caminho inválido: cada processo falha ao abrir o arquivo de resultados
+    monkeypatch.setattr(Settings, "RESULTS_FILE", "/proc/inexistente/r.csv")
+
+    uploader = ShardedUploader(path, "token", "http://api.local/items", delimiter=",", processes=2)
+    uploader.start_upload()
+
+    assert not uploader.completed
+    assert sorted(uploader.failed_shards) == [0, 1]
+    assert all("FileNotFoundError" in reason for reason in uploader.failed_shards.values())
+
+
+def test_global_budgets_are_split_across_shards(write_csv, monkeypatch):
+    path = write_csv([(i, f"nome{i}") for i in range(20)])
+    monkeypatch.setattr(Settings, "ADAPTIVE_MAX_CONCURRENCY", 100)
+    monkeypatch.setattr(Settings, "HTTP_POOL_LIMIT", 30)
+    uploader = ShardedUploader(path, "token", "http://api.local/items", delimiter=",", processes=4,
+                               concurrency=10, rate_limit=40, adaptive=True)
+    shards = [(0, 1)] * 4
+    snapshot = {name: value for name, value in vars(Settings).items() if name.isupper()}
+
+    options = [uploader._shard_options(shard_id, shards) for shard_id in range(4)]
+    settings = [uploader._shard_settings(snapshot, shard_id, shards) for shard_id in range(4)]
+
+    assert sum(o["concurrency"] for o in options) == 10
+    assert sum(o["rate_limit"] for o in options) == 40
+    assert sum(s["ADAPTIVE_MAX_CONCURRENCY"] for s in settings) == 100
+    assert sum(s["HTTP_POOL_LIMIT"] for s in settings) == 30
+
+
+def test_dedup_requires_a_single_process(write_csv, monkeypatch):
+    path = write_csv([(1, "a")])
+    monkeypatch.setattr(Settings, "DEDUP_MODE", "exact")
+    with pytest.raises(ValueError):
+        ShardedUploader(path, "token", "http://api.local/items", delimiter=",", processes=2)
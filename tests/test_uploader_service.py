@@ -0,0 +1,133 @@
+# tests/test_uploader_service.py
+import asyncio
+import os
+import random
+
+from clients.retry_policy import RetryPolicy
+from config import Settings
+from services.uploader_service import UploaderService
+
+
+def _uploader(path, **kwargs):
+    kwargs.setdefault("retry_policy", RetryPolicy(max_attempts=1))
+    kwargs.setdefault("concurrency", 5)
+    return UploaderService(path, "token", "http://api.local/items", delimiter=",", **kwargs)
+
+
+def test_checkpoint_resume_sends_only_undelivered_rows(write_csv, fake_api):
+    path = write_csv([(i, f"nome{i}") for i in range(50)])
+
+    # Primeira execução: a API cai a partir da linha 30
+    fake_api.handler = lambda row: 503 if int(row["id"]) >= 30 else 200
+    first = _uploader(path, checkpoint=True)
+    first.start_upload()
+    assert first.ok_count == 30
+    assert os.listdir("checkpoints")
+
+    # Retomada: só as linhas não entregues são reenviadas
+    fake_api.requests.clear()
+    fake_api.handler = lambda row: 200
+    second = _uploader(path, checkpoint=True)
+    second.start_upload()
+    assert sorted(int(row["id"]) for row in fake_api.requests) == list(range(30, 50))
+    # Tudo entregue: o journal é removido
+    assert not os.listdir("checkpoints")
+
+
+def test_checkpoint_does_not_resend_rows_rejected_for_good(write_csv, fake_api):
+    path = write_csv([(i, f"nome{i}") for i in range(10)])
+
+    # 422 é definitivo (conta como entregue); 503 fica para a retomada
+    statuses = {"3": 422, "7": 503}
+    fake_api.handler = lambda row: statuses.get(row["id"], 200)
+    _uploader(path, checkpoint=True).start_upload()
+
+    fake_api.requests.clear()
+    fake_api.handler = lambda row: 200
+    _uploader(path, checkpoint=True).start_upload()
+    assert [row["id"] for row in fake_api.requests] == ["7"]
+
+
+def test_rejected_batch_is_split_until_the_bad_rows_are_isolated(write_csv, fake_api):
+    path = write_csv([(i, f"nome{i}") for i in range(20)])
+    bad = {"5", "13"}
+    accepted = []
+
+    def handler(rows):
+        if any(row["id"] in bad for row in rows):
+            return 422
+        accepted.extend(row["id"] for row in rows)
+        return 200
+
+    fake_api.handler = handler
+    uploader = _uploader(path, batch_size=8, failed_rows_file="failed.csv")
+    uploader.start_upload()
+
+    assert uploader.ok_count == 18
+    assert uploader.error_count == 2
+    # Cada linha válida foi aceita exatamente uma vez
+    assert sorted(accepted, key=int) == [str(i) for i in range(20) if str(i) not in bad]
+    # As inválidas terminam sozinhas no CSV de falhas
+    with open("failed.csv", encoding="utf-8") as f:
+        header, *rows = f.read().splitlines()
+    assert header == "id,name"
+    assert sorted(rows) == ["13,nome13", "5,nome5"]
+
+
+def test_ordered_delivery_per_key_with_retries(write_csv, fake_api, monkeypatch):
+    # Poucas vagas de espera para exercitar a pausa da leitura
+    monkeypatch.setattr(Settings, "ORDER_MAX_PARKED", 10)
+    rows = [("hot" if i % 2 else f"k{i % 7}", i) for i in range(200)]
+    path = write_csv(rows, header=("key", "seq"))
+    in_flight = set()
+    delivered = []
+    failed_once = set()
+
+    async def handler(row):
+        key, seq = row["key"], int(row["seq"])
+        assert key not in in_flight, f"duas linhas da chave {key} em paralelo"
+        in_flight.add(key)
+        await asyncio.sleep(random.random() * 0.002)
+        in_flight.discard(key)
+        # Uma falha retentável a cada 25 linhas, na primeira tentativa
+        if seq % 25 == 0 and seq not in failed_once:
+            failed_once.add(seq)
+            return 503
+        delivered.append((key, seq))
+        return 200
+
+    fake_api.handler = handler
+    uploader = _uploader(
+        path,
+        concurrency=10,
+        order_keys=("key",),
+        retry_policy=RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.001),
+    )
+    uploader.start_upload()
+
+    assert uploader.ok_count == 200
+    by_key = {}
+    for key, seq in delivered:
+        by_key.setdefault(key, []).append(seq)
+    for key, sequence in by_key.items():
+        assert sequence == sorted(sequence), f"chave {key} fora de ordem"
+    # Nada ficou preso no estado da ordenação
+    assert uploader._parked == 0
+    assert not uploader._key_chains
+
+
+def test_resume_appends_to_the_results_file(write_csv, fake_api):
+    path = write_csv([(i, f"nome{i}") for i in range(20)])
+
+    fake_api.handler = lambda row: 503 if int(row["id"]) >= 15 else 200
+    _uploader(path, checkpoint=True, results_file="results.csv").start_upload()
+
+    fake_api.handler = lambda row: 200
+    _uploader(path, checkpoint=True, results_file="results.csv").start_upload()
+
+    with open("results.csv", encoding="utf-8") as f:
+        header, *records = f.read().splitlines()
+    assert header.startswith("row,status")
+    # 20 da primeira execução + 5 reenviadas na retomada, sem repetir o cabeçalho
+    assert len(records) == 25
+    assert sum(record.split(",")[1] == "200" for record in records) == 20
@@ -1,6 +1,10 @@
 # utils/__init__.py
 
 from .csv_utils import read_csv_preview
-from .logger import log_message
+from .csv_reader import CSVRowReader
+from .logger import log_message, LogPipeline
+from .error_sink import ErrorSink
+from .dedup import RowHasher, RowDeduplicator
+from .result_sink import ResultSink
 
-__all__ = ["read_csv_preview", "log_message"]
+__all__ = ["read_csv_preview", "CSVRowReader", "log_message", "LogPipeline", "ErrorSink", "RowHasher", "RowDeduplicator", "ResultSink"]
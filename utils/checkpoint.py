@@ -0,0 +1,161 @@
+# utils/checkpoint.py
+import bisect
+import hashlib
+import json
+import os
+
+from config import Settings
+
+
+def file_fingerprint(file_path, sample_bytes=1024 * 1024):
+    """
+    Identifica o conteúdo do arquivo de forma barata: hash do tamanho,
+    do primeiro e do último bloco de sample_bytes.
+    """
+    size = os.path.getsize(file_path)
+    digest = hashlib.sha256(str(size).encode())
+    with open(file_path, "rb") as f:
+        digest.update(f.read(sample_bytes))
+        if size > sample_bytes:
+            f.seek(max(sample_bytes, size - sample_bytes))
+            digest.update(f.read(sample_bytes))
+    return digest.hexdigest()
+
+
+class CheckpointJournal:
+    """
+    Journal compacto de progresso de um envio.
+
+    As linhas concluídas são guardadas como intervalos [início, fim] de
+    índices, cada um com o offset em bytes logo após sua última linha.
+    Assim, na retomada, o leitor pula direto para o fim do primeiro
+    intervalo contíguo e ignora apenas os intervalos esparsos seguintes.
+    O journal é regravado de forma atômica (arquivo temporário + fsync +
+    rename) a cada `interval` segundos, não a cada linha.
+    """
+
+    def __init__(self, file_path, delimiter, checkpoint_dir=None, scope=None):
+        """
+        :param scope: Identifica uma parte do arquivo (ex.: a faixa de bytes
+                      de um shard), para que cada parte tenha seu próprio journal
+        """
+        settings = Settings()
+
+        self.file_path = file_path
+        self.delimiter = delimiter
+        self.scope = scope
+        self.fingerprint = file_fingerprint(file_path)
+        directory = checkpoint_dir or settings.CHECKPOINT_DIR
+        name = f"{self.fingerprint[:32]}_{scope}" if scope else self.fingerprint[:32]
+        self.path = os.path.join(directory, f"{name}.journal")
+
+        # Intervalos ordenados e disjuntos: _starts[i].._ends[i], offset _offsets[i]
+        self._starts = []
+        self._ends = []
+        self._offsets = []
+        self._dirty = False
+
+    # =====================
+    # Estado
+    # =====================
+    def load(self):
+        """
+        Carrega o journal do disco, se existir e corresponder ao mesmo
+        arquivo e delimitador. Retorna True se havia progresso salvo.
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if (data.get("fingerprint") != self.fingerprint or data.get("delimiter") != self.delimiter
+                or data.get("scope") != self.scope):
+            return False
+        ranges = data.get("ranges", [])
+        self._starts = [r[0] for r in ranges]
+        self._ends = [r[1] for r in ranges]
+        self._offsets = [r[2] for r in ranges]
+        return bool(ranges)
+
+    @property
+    def delivered(self):
+        """Total de linhas marcadas como concluídas."""
+        return sum(e - s + 1 for s, e in zip(self._starts, self._ends))
+
+    @property
+    def resume_point(self):
+        """
+        (último índice contíguo concluído desde a linha 1, offset em bytes
+        para continuar a leitura). (0, None) se não há prefixo concluído.
+        """
+        if self._starts and self._starts[0] == 1:
+            return self._ends[0], self._offsets[0]
+        return 0, None
+
+    def is_done(self, idx):
+        i = bisect.bisect_right(self._starts, idx) - 1
+        return i >= 0 and idx <= self._ends[i]
+
+    def mark_done(self, idx, offset):
+        """
+        Marca a linha `idx` (terminada no byte `offset`) como concluída,
+        fundindo intervalos adjacentes.
+        """
+        i = bisect.bisect_right(self._starts, idx) - 1
+        if i >= 0 and idx <= self._ends[i]:
+            return
+        joins_left = i >= 0 and self._ends[i] == idx - 1
+        joins_right = i + 1 < len(self._starts) and self._starts[i + 1] == idx + 1
+
+        if joins_left and joins_right:
+            self._ends[i] = self._ends[i + 1]
+            self._offsets[i] = self._offsets[i + 1]
+            del self._starts[i + 1], self._ends[i + 1], self._offsets[i + 1]
+        elif joins_left:
+            self._ends[i] = idx
+            self._offsets[i] = offset
+        elif joins_right:
+            self._starts[i + 1] = idx
+        else:
+            self._starts.insert(i + 1, idx)
+            self._ends.insert(i + 1, idx)
+            self._offsets.insert(i + 1, offset)
+        self._dirty = True
+
+    # =====================
+    # Persistência
+    # =====================
+    def snapshot(self):
+        """
+        Retorna uma cópia do estado a gravar (ou None se nada mudou),
+        para que a escrita possa ocorrer fora do event loop.
+        """
+        if not self._dirty:
+            return None
+        self._dirty = False
+        return {
+            "fingerprint": self.fingerprint,
+            "file": os.path.abspath(self.file_path),
+            "delimiter": self.delimiter,
+            "scope": self.scope,
+            "ranges": [list(r) for r in zip(self._starts, self._ends, self._offsets)],
+        }
+
+    def write(self, snapshot):
+        """Grava o snapshot de forma atômica e durável."""
+        if snapshot is None:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def remove(self):
+        """Apaga o journal (envio concluído sem pendências)."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,167 @@
+# utils/csv_reader.py
+import csv
+
+from config import Settings
+
+_TRUE = frozenset(("true", "1", "yes", "y", "t", "sim", "s"))
+_FALSE = frozenset(("false", "0", "no", "n", "f", "nao", "não"))
+
+
+def _to_int(value):
+    if value == "":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def _to_float(value):
+    if value == "":
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        try:
+            # Aceita vírgula decimal (ex.: "1234,56")
+            return float(value.replace(",", "."))
+        except ValueError:
+            return value
+
+
+def _to_bool(value):
+    lowered = value.strip().lower()
+    if lowered in _TRUE:
+        return True
+    if lowered in _FALSE:
+        return False
+    return None if value == "" else value
+
+
+def _to_null(value):
+    return None if value == "" else value
+
+
+# Tipo declarado → conversor (None = mantém o texto como está)
+CONVERTERS = {
+    "str": None,
+    "int": _to_int,
+    "float": _to_float,
+    "bool": _to_bool,
+    "null": _to_null,
+}
+
+
+class CSVRowReader:
+    """
+    Leitor de CSV que guarda o cabeçalho uma única vez e devolve cada
+    linha como uma sequência de valores (sem um dict por linha), lendo o
+    arquivo em blocos grandes.
+
+    Um schema opcional ({"coluna": tipo}) converte os valores e descarta
+    colunas ("skip") durante a leitura. Tipos: str, int, float, bool,
+    null (texto, com vazio → None) e skip. Valores que não convertem são
+    mantidos como texto.
+    """
+
+    def __init__(self, file_path, delimiter=",", schema=None, buffer_size=None):
+        settings = Settings()
+
+        self.file_path = file_path
+        self.delimiter = delimiter
+        self.schema = dict(settings.CSV_SCHEMA if schema is None else schema)
+        self.buffer_size = buffer_size or settings.CSV_BUFFER_SIZE
+        for column, kind in self.schema.items():
+            if kind != "skip" and kind not in CONVERTERS:
+                raise ValueError(f"Tipo desconhecido para a coluna '{column}': {kind}")
+
+        self.header = self._read_header()
+        # Plano de leitura: (índice no arquivo, conversor) das colunas mantidas
+        self._plan = [
+            (index, CONVERTERS[self.schema.get(name, "str")])
+            for index, name in enumerate(self.header)
+            if self.schema.get(name) != "skip"
+        ]
+        self.columns = tuple(self.header[index] for index, _ in self._plan)
+        self._identity = len(self._plan) == len(self.header) and all(conv is None for _, conv in self._plan)
+
+    def _read_header(self):
+        with open(self.file_path, newline="", encoding="utf-8") as f:
+            return next(csv.reader(f, delimiter=self.delimiter), [])
+
+    def _project(self, values):
+        """Aplica o schema a uma linha bruta (lista de textos)."""
+        if self._identity:
+            return values
+        try:
+            return tuple(values[i] if conv is None else conv(values[i]) for i, conv in self._plan)
+        except IndexError:
+            # Linha com menos colunas que o cabeçalho
+            return tuple(
+                (values[i] if conv is None else conv(values[i])) if i < len(values) else None
+                for i, conv in self._plan
+            )
+
+    def to_dict(self, values):
+        """Monta o dict {coluna: valor} de uma linha, só quando necessário."""
+        row = dict(zip(self.columns, values))
+        if len(values) < len(self.columns):
+            for column in self.columns[len(values):]:
+                row[column] = None
+        return row
+
+    def __iter__(self):
+        """Percorre as linhas de dados (sem o cabeçalho)."""
+        project = self._project
+        for values in self._iter_raw():
+            yield project(values)
+
+    def iter_with_raw(self):
+        """Como __iter__, devolvendo (linha, linha bruta como lida do arquivo)."""
+        project = self._project
+        for values in self._iter_raw():
+            yield project(values), values
+
+    def _iter_raw(self):
+        with open(self.file_path, newline="", encoding="utf-8", buffering=self.buffer_size) as f:
+            reader = csv.reader(f, delimiter=self.delimiter)
+            next(reader, None)
+            for values in reader:
+                if values:
+                    yield values
+
+    def iter_with_offsets(self, start_offset=None, end_offset=None, with_raw=False):
+        """
+        Como __iter__, devolvendo (linha, offset) onde offset é a posição em
+        bytes logo após a linha. start_offset pula direto para uma posição
+        (após ler o cabeçalho); end_offset para na primeira linha que começa
+        nela ou depois. Com with_raw, devolve (linha, offset, linha bruta).
+        """
+        project = self._project
+        with open(self.file_path, "rb", buffering=self.buffer_size) as f:
+            position = 0
+
+            def lines():
+                nonlocal position
+                for raw in f:
+                    position += len(raw)
+                    yield raw.decode("utf-8")
+
+            line_iter = lines()
+            reader = csv.reader(line_iter, delimiter=self.delimiter)
+            if next(reader, None) is None:
+                return
+            if start_offset is not None and start_offset > position:
+                f.seek(start_offset)
+                position = start_offset
+            if end_offset is not None and position >= end_offset:
+                return
+
+            for values in reader:
+                if values:
+                    if with_raw:
+                        yield project(values), position, values
+                    else:
+                        yield project(values), position
+                if end_offset is not None and position >= end_offset:
+                    return
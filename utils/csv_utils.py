@@ -1,28 +1,136 @@
 # utils/csv_utils.py
 import csv
+import io
+import os
 
-def read_csv_preview(file_path, delimiter=",", num_lines=3):
+from utils.csv_reader import CSVRowReader
+
+def read_csv_head(file_path, max_bytes=65536):
     """
-    Lê as primeiras linhas de um CSV para exibir como preview.
+    Lê o início do CSV uma única vez, cortado na última linha completa.
+    Retorna (texto, tamanho do arquivo em bytes).
+    """
+    size = os.path.getsize(file_path)
+    with open(file_path, "rb") as f:
+        head = f.read(max_bytes)
+    if len(head) < size:
+        cut = head.rfind(b"\n")
+        if cut >= 0:
+            head = head[:cut + 1]
+    return head.decode("utf-8", errors="replace"), size
+
+def parse_csv_preview(text, delimiter=",", num_lines=3):
+    """
+    Interpreta as primeiras linhas de um trecho de CSV já lido.
     Retorna uma lista de dicionários (cada linha representada como dict).
     """
     preview = []
-    with open(file_path, newline="", encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile, delimiter=delimiter)
-        for i, row in enumerate(reader):
-            if i >= num_lines:
-                break
-            preview.append(row)
+    reader = csv.DictReader(io.StringIO(text, newline=""), delimiter=delimiter)
+    for i, row in enumerate(reader):
+        if i >= num_lines:
+            break
+        preview.append(row)
     return preview
 
-def read_csv_rows(file_path, delimiter=","):
+def sniff_delimiter(text, candidates=",;\t|", max_lines=20):
+    """
+    Detecta o delimitador a partir das primeiras linhas do CSV.
+    Retorna None se não for possível decidir.
+    """
+    sample = "\n".join(text.splitlines()[:max_lines])
+    if not sample:
+        return None
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=candidates).delimiter
+    except csv.Error:
+        return None
+
+def read_csv_preview(file_path, delimiter=",", num_lines=3):
+    """
+    Lê as primeiras linhas de um CSV para exibir como preview.
+    Retorna uma lista de dicionários (cada linha representada como dict).
+    """
+    text, _ = read_csv_head(file_path)
+    return parse_csv_preview(text, delimiter, num_lines)
+
+def read_csv_rows(file_path, delimiter=",", schema=None):
     """
-    Lê todas as linhas de um CSV.
+    Lê todas as linhas de um CSV, aplicando o schema de colunas opcional.
     Retorna uma lista de dicionários.
     """
-    rows = []
-    with open(file_path, newline="", encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile, delimiter=delimiter)
-        for row in reader:
-            rows.append(row)
-    return rows
+    reader = CSVRowReader(file_path, delimiter, schema)
+    return [reader.to_dict(values) for values in reader]
+
+def estimate_csv_rows(file_path, sample_bytes=65536):
+    """
+    Estima rapidamente o número de linhas de dados do CSV a partir do
+    tamanho do arquivo e do tamanho médio das linhas de uma amostra inicial.
+    """
+    size = os.path.getsize(file_path)
+    if size == 0:
+        return 0
+    with open(file_path, "rb") as f:
+        sample = f.read(sample_bytes)
+    return estimate_rows_from_sample(sample, size)
+
+def estimate_rows_from_sample(sample, size):
+    """
+    Estima as linhas de dados de um arquivo de `size` bytes a partir de
+    uma amostra do seu início (bytes ou texto).
+    """
+    if size == 0:
+        return 0
+    newline = b"\n" if isinstance(sample, bytes) else "\n"
+    lines = sample.count(newline)
+    if len(sample) >= size:
+        # Arquivo inteiro coube na amostra: contagem exata (menos o cabeçalho)
+        if not sample.endswith(newline):
+            lines += 1
+        return max(0, lines - 1)
+    if lines == 0:
+        return 1
+    return max(0, int(size / (len(sample) / lines)) - 1)
+
+def count_csv_rows(file_path, chunk_size=1024 * 1024):
+    """
+    Conta as linhas de dados do CSV lendo o arquivo em blocos binários,
+    sem interpretar os campos. Campos com quebra de linha entre aspas
+    são contados como linhas extras.
+    """
+    lines = 0
+    last = b""
+    with open(file_path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            lines += chunk.count(b"\n")
+            last = chunk
+    if last and not last.endswith(b"\n"):
+        lines += 1
+    return max(0, lines - 1)
+
+def compute_shards(file_path, shards):
+    """
+    Divide o corpo do CSV (após o cabeçalho) em até `shards` faixas de
+    bytes (início, fim) alinhadas ao início de linhas.
+    Supõe que campos entre aspas não contenham quebras de linha.
+    """
+    size = os.path.getsize(file_path)
+    with open(file_path, "rb") as f:
+        header_end = len(f.readline())
+        bounds = [header_end]
+        for i in range(1, shards):
+            target = header_end + (size - header_end) * i // shards
+            if target <= bounds[-1]:
+                continue
+            # Avança até o início da próxima linha completa
+            f.seek(target - 1)
+            f.readline()
+            position = f.tell()
+            if position >= size:
+                break
+            if position > bounds[-1]:
+                bounds.append(position)
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
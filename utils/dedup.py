@@ -0,0 +1,123 @@
+# utils/dedup.py
+import math
+from hashlib import blake2b
+
+from config import Settings
+
+
+class RowHasher:
+    """
+    Calcula um hash estável (16 bytes) de uma linha do CSV, usando a linha
+    inteira ou apenas as colunas-chave. O mesmo conteúdo gera o mesmo hash
+    em qualquer execução, o que permite usá-lo como Idempotency-Key.
+    """
+
+    def __init__(self, columns, key_columns=None):
+        columns = tuple(columns)
+        key_columns = tuple(key_columns or ())
+        missing = [name for name in key_columns if name not in columns]
+        if missing:
+            raise ValueError(f"Colunas-chave ausentes no CSV: {', '.join(missing)}")
+        self.key_indexes = tuple(columns.index(name) for name in key_columns) or None
+
+    def digest(self, values):
+        if self.key_indexes is not None:
+            size = len(values)
+            values = [values[i] if i < size else None for i in self.key_indexes]
+        # \x1f (separador de unidade) não aparece em dados normais de CSV
+        text = "\x1f".join("" if value is None else str(value) for value in values)
+        return blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def key(self, values):
+        """Chave de idempotência (hex) da linha."""
+        return self.digest(values).hex()
+
+
+def body_key(body):
+    """Chave de idempotência (hex) de um corpo já codificado, ex.: um lote."""
+    return blake2b(body, digest_size=16).hexdigest()
+
+
+class ExactFilter:
+    """Conjunto exato de hashes já vistos (8 bytes de cada hash, como int)."""
+
+    def __init__(self):
+        self._seen = set()
+
+    def add(self, digest):
+        """Registra o hash; retorna True se ele já tinha sido visto."""
+        key = int.from_bytes(digest[:8], "little")
+        if key in self._seen:
+            return True
+        self._seen.add(key)
+        return False
+
+    def __len__(self):
+        return len(self._seen)
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom com memória fixa, dimensionado pela capacidade e taxa
+    de falso positivo desejadas. Pode apontar como duplicada uma linha
+    nova (com a probabilidade configurada), mas nunca o contrário.
+    """
+
+    def __init__(self, capacity, error_rate):
+        capacity = max(1, int(capacity))
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self._count = 0
+
+    def add(self, digest):
+        """Registra o hash; retorna True se ele (provavelmente) já tinha sido visto."""
+        # Hashing duplo: as k posições derivam das duas metades do hash
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        bits, size = self._bits, self.size
+        present = True
+        for i in range(self.hashes):
+            position = (h1 + i * h2) % size
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                present = False
+                bits[byte] |= mask
+        if not present:
+            self._count += 1
+        return present
+
+    def __len__(self):
+        return self._count
+
+
+class RowDeduplicator:
+    """
+    Descarta linhas repetidas dentro de um envio, comparando o hash da
+    linha (ou das colunas-chave). Modo "exact" guarda todos os hashes;
+    modo "bloom" limita a memória para arquivos muito grandes.
+    """
+
+    MODES = ("exact", "bloom")
+
+    def __init__(self, hasher, mode=None, capacity=None, error_rate=None):
+        settings = Settings()
+
+        self.hasher = hasher
+        self.mode = mode or settings.DEDUP_MODE
+        if self.mode == "exact":
+            self._filter = ExactFilter()
+        elif self.mode == "bloom":
+            self._filter = BloomFilter(
+                capacity or settings.DEDUP_BLOOM_CAPACITY,
+                error_rate or settings.DEDUP_BLOOM_ERROR_RATE,
+            )
+        else:
+            raise ValueError(f"Modo de deduplicação desconhecido: {self.mode}")
+        self.duplicates = 0
+
+    def is_duplicate(self, values):
+        if self._filter.add(self.hasher.digest(values)):
+            self.duplicates += 1
+            return True
+        return False
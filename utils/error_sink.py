@@ -0,0 +1,141 @@
+# utils/error_sink.py
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from config import Settings
+
+
+class ErrorSink:
+    """
+    Destino assíncrono e append-only para registros de erro HTTP.
+
+    Os registros são enfileirados sem bloquear o chamador (event loop) e
+    uma única thread em background os grava em lotes em um arquivo JSONL,
+    rotacionado por tamanho e/ou tempo.
+    """
+
+    def __init__(self, log_dir=None, file_name=None, max_bytes=None, rotate_seconds=None,
+                 batch_size=None, flush_interval=None, queue_size=None):
+        settings = Settings()
+
+        self.log_dir = log_dir or settings.ERROR_LOG_DIR
+        self.file_name = file_name or settings.ERROR_LOG_FILE
+        self.max_bytes = max_bytes if max_bytes is not None else settings.ERROR_LOG_MAX_BYTES
+        self.rotate_seconds = rotate_seconds if rotate_seconds is not None else settings.ERROR_LOG_ROTATE_SECONDS
+        self.batch_size = batch_size or settings.ERROR_LOG_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.ERROR_LOG_FLUSH_INTERVAL
+        self.path = os.path.join(self.log_dir, self.file_name)
+
+        self.written = 0
+        self.dropped = 0
+
+        self._queue = queue.Queue(maxsize=queue_size or settings.ERROR_LOG_QUEUE_SIZE)
+        self._file = None
+        self._opened_at = None
+        self._thread = None
+        self._closed = False
+
+    def start(self):
+        """Inicia a thread de escrita (idempotente)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="error-sink", daemon=True)
+            self._thread.start()
+        return self
+
+    def emit(self, record):
+        """
+        Enfileira um registro (dict) para gravação. Nunca bloqueia:
+        se a fila estiver cheia o registro é descartado e contabilizado.
+        """
+        if self._closed:
+            return
+        if self._thread is None:
+            self.start()
+        if "timestamp" not in record:
+            record["timestamp"] = datetime.now().isoformat()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """
+        Grava todos os registros pendentes e encerra a thread de escrita.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        if self.written:
+            print(f"{self.written} erro(s) HTTP registrados em: {self.path}")
+        if self.dropped:
+            print(f"{self.dropped} erro(s) HTTP descartados (fila de log cheia)")
+
+    # =====================
+    # Thread de escrita
+    # =====================
+    def _run(self):
+        try:
+            while True:
+                batch = []
+                stop = False
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+                while item is not None:
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                else:
+                    stop = True
+
+                if batch:
+                    self._write_batch(batch)
+                if stop:
+                    return
+        finally:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _write_batch(self, batch):
+        try:
+            self._rotate_if_needed()
+            lines = "".join(json.dumps(record, ensure_ascii=False, default=str) + "\n" for record in batch)
+            self._file.write(lines)
+            self._file.flush()
+            self.written += len(batch)
+        except Exception as e:
+            print(f"Falha ao escrever log de erro: {e}")
+
+    def _rotate_if_needed(self):
+        if self._file is not None:
+            too_big = self.max_bytes and self._file.tell() >= self.max_bytes
+            too_old = self.rotate_seconds and time.time() - self._opened_at >= self.rotate_seconds
+            if not (too_big or too_old):
+                return
+            self._file.close()
+            self._file = None
+            base, ext = os.path.splitext(self.path)
+            rotated = f"{base}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{ext}"
+            suffix = 1
+            while os.path.exists(rotated):
+                rotated = f"{base}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{suffix}{ext}"
+                suffix += 1
+            os.replace(self.path, rotated)
+
+        os.makedirs(self.log_dir, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._opened_at = time.time()
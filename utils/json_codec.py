@@ -0,0 +1,39 @@
+# utils/json_codec.py
+import json
+from json.encoder import encode_basestring
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional; sem ele usamos o json da stdlib
+    orjson = None
+
+
+def dumps(obj):
+    """Serializa um objeto para JSON compacto em bytes UTF-8, com orjson se disponível."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _encode_float(value):
+    if value != value or value in (float("inf"), float("-inf")):
+        return "null"
+    return float.__repr__(value)
+
+
+# Codificação de valores escalares direto para texto JSON, sem montar documento
+_SCALAR_ENCODERS = {
+    str: encode_basestring,
+    int: int.__repr__,
+    float: _encode_float,
+    bool: lambda value: "true" if value else "false",
+    type(None): lambda value: "null",
+}
+
+
+def encode_value(value):
+    """Codifica um único valor como fragmento de texto JSON."""
+    encoder = _SCALAR_ENCODERS.get(type(value))
+    if encoder is not None:
+        return encoder(value)
+    return dumps(value).decode("utf-8")
@@ -0,0 +1,89 @@
+# utils/json_path.py
+import json
+import re
+from functools import lru_cache
+
+from config import Settings
+
+# Caminhos simples como $.a.b[0].c dispensam o jsonpath-ng
+_SIMPLE_PATH = re.compile(r"^\$((\.[A-Za-z_][A-Za-z0-9_-]*)|(\[\d+\]))*$")
+_SIMPLE_STEP = re.compile(r"\.([A-Za-z_][A-Za-z0-9_-]*)|\[(\d+)\]")
+
+
+def _compile_simple(steps):
+    def find(data):
+        for key in steps:
+            try:
+                data = data[key]
+            except (KeyError, IndexError, TypeError):
+                return []
+        return [data]
+    return find
+
+
+# lru_cache de _compile_json_path, criado no primeiro uso com o tamanho configurado
+_cached_compile = None
+
+
+def compile_json_path(path):
+    """
+    Compila uma expressão JSONPath uma única vez (cache LRU) e devolve uma
+    função data -> lista de valores encontrados. Caminhos simples
+    ($.a.b[0]) usam um caminho rápido sem o parser do jsonpath-ng.
+
+    O tamanho do cache vem de Settings.JSON_PATH_CACHE_SIZE no momento do
+    uso (não da importação): se a configuração mudar, o cache é recriado.
+    """
+    global _cached_compile
+    size = Settings().JSON_PATH_CACHE_SIZE
+    if _cached_compile is None or _cached_compile.cache_parameters()["maxsize"] != size:
+        _cached_compile = lru_cache(maxsize=size)(_compile_json_path)
+    return _cached_compile(path)
+
+
+def _compile_json_path(path):
+    if _SIMPLE_PATH.match(path):
+        steps = tuple(
+            name if name else int(index)
+            for name, index in _SIMPLE_STEP.findall(path)
+        )
+        return _compile_simple(steps)
+
+    # Import tardio: o jsonpath-ng (PLY) só é carregado para expressões complexas
+    from jsonpath_ng import parse
+    expression = parse(path)
+    return lambda data: [match.value for match in expression.find(data)]
+
+
+def extract_first(json_data, path):
+    """Primeiro valor encontrado por `path` em json_data, ou None."""
+    matches = compile_json_path(path)(json_data)
+    return matches[0] if matches else None
+
+
+class ResponseExtractor:
+    """
+    Extrai campos nomeados de respostas JSON, ex.: {"id": "$.data.id"}.
+    As expressões são compiladas uma vez na criação, não a cada linha.
+    """
+
+    def __init__(self, fields):
+        self.fields = dict(fields)
+        self._finders = [(name, compile_json_path(path)) for name, path in self.fields.items()]
+
+    def __bool__(self):
+        return bool(self._finders)
+
+    def extract(self, json_data):
+        result = {}
+        for name, find in self._finders:
+            matches = find(json_data)
+            result[name] = matches[0] if matches else None
+        return result
+
+    def extract_text(self, text):
+        """Como extract, a partir do texto da resposta; {} se não for JSON."""
+        try:
+            return self.extract(json.loads(text))
+        except (TypeError, ValueError):
+            return {}
@@ -1,4 +1,5 @@
 # utils/logger.py
+import queue
 
 def log_message(log_widget, message: str):
     """
@@ -7,3 +8,71 @@ def log_message(log_widget, message: str):
     """
     log_widget.insert("end", message + "\n")
     log_widget.see("end")
+
+
+class LogPipeline:
+    """
+    Encaminha mensagens de log de qualquer thread para um widget Text do Tk.
+
+    As mensagens entram em uma fila thread-safe e são aplicadas ao widget
+    em lotes pela thread do Tk (via root.after). O widget mantém apenas as
+    últimas max_lines linhas; opcionalmente o log completo vai para um arquivo.
+    """
+
+    def __init__(self, log_widget, max_lines=1000, log_file=None, batch_size=5000):
+        self.log_widget = log_widget
+        self.max_lines = max_lines
+        self.batch_size = batch_size
+        self._queue = queue.SimpleQueue()
+        self._file = open(log_file, "a", encoding="utf-8") if log_file else None
+        self._after_id = None
+
+    def put(self, message: str):
+        """Enfileira uma mensagem. Pode ser chamado de qualquer thread."""
+        self._queue.put(message)
+
+    def drain(self):
+        """
+        Aplica as mensagens pendentes ao widget. Deve rodar na thread do Tk.
+        Retorna quantas mensagens foram processadas.
+        """
+        batch = []
+        try:
+            while len(batch) < self.batch_size:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        if not batch:
+            return 0
+
+        if self._file is not None:
+            self._file.write("\n".join(batch) + "\n")
+            self._file.flush()
+
+        # Só as últimas linhas do lote chegam a aparecer no widget
+        visible = batch[-self.max_lines:] if self.max_lines else batch
+        self.log_widget.insert("end", "\n".join(visible) + "\n")
+        if self.max_lines:
+            lines = int(self.log_widget.index("end-1c").split(".")[0]) - 1
+            if lines > self.max_lines:
+                self.log_widget.delete("1.0", f"{lines - self.max_lines + 1}.0")
+        self.log_widget.see("end")
+        return len(batch)
+
+    def schedule(self, root, interval_ms=100):
+        """Drena a fila periodicamente no event loop do Tk."""
+        def tick():
+            self.drain()
+            self._after_id = root.after(interval_ms, tick)
+        self._after_id = root.after(interval_ms, tick)
+
+    def close(self, root=None):
+        """Cancela o timer, aplica o que restou e fecha o arquivo de log."""
+        if root is not None and self._after_id is not None:
+            root.after_cancel(self._after_id)
+            self._after_id = None
+        while self.drain():
+            pass
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,260 @@
+# utils/metrics.py
+import json
+import os
+import time
+from collections import Counter
+
+
+class LatencyHistogram:
+    """
+    Histograma de latências no estilo HDR: buckets lineares para valores
+    pequenos e log-lineares acima deles, com erro relativo de ~1,5%.
+    Valores em microssegundos; registrar custa uma operação de bits e um
+    incremento em dicionário.
+    """
+
+    SIGNIFICANT_BITS = 7
+    SUB_BUCKETS = 1 << SIGNIFICANT_BITS
+    HALF = SUB_BUCKETS >> 1
+
+    def __init__(self):
+        self.counts = Counter()
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, seconds):
+        value = int(seconds * 1_000_000)
+        if value < self.SUB_BUCKETS:
+            index = max(0, value)
+        else:
+            shift = value.bit_length() - self.SIGNIFICANT_BITS
+            index = shift * self.HALF + (value >> shift)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @classmethod
+    def _bucket_value(cls, index):
+        """Valor representativo (meio do bucket) em microssegundos."""
+        if index < cls.SUB_BUCKETS:
+            return index
+        shift = index // cls.HALF - 1
+        lower = (index - shift * cls.HALF) << shift
+        return lower + (1 << shift) // 2
+
+    def percentile(self, percent):
+        """Latência (segundos) abaixo da qual estão `percent`% das amostras."""
+        if not self.count:
+            return 0.0
+        target = max(1, round(self.count * percent / 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._bucket_value(index), self.max) / 1_000_000
+        return self.max / 1_000_000
+
+    def merge(self, state):
+        """Soma o estado exportado (export_state) de outro histograma."""
+        for index, count in state["counts"].items():
+            self.counts[int(index)] += count
+        self.count += state["count"]
+        self.total += state["total"]
+        self.max = max(self.max, state["max"])
+
+    def export_state(self):
+        return {"counts": dict(self.counts), "count": self.count, "total": self.total, "max": self.max}
+
+
+class Metrics:
+    """
+    Métricas de um envio: histograma de latência, contagem por status HTTP
+    e por classe de exceção, bytes enviados/recebidos, requisições em
+    andamento e contadores livres (linhas OK, erros, retentativas...).
+
+    Só é alterado pelo event loop; outras threads (GUI) devem ler
+    `last_snapshot`, atualizado por snapshot().
+    """
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.statuses = Counter()
+        self.exceptions = Counter()
+        self.counters = Counter()
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.started_at = time.time()
+        self.last_snapshot = None
+        self._last_requests = 0
+        self._last_snapshot_at = time.monotonic()
+
+    # =====================
+    # Registro
+    # =====================
+    def request_started(self, bytes_sent=0):
+        self.in_flight += 1
+        if self.in_flight > self.max_in_flight:
+            self.max_in_flight = self.in_flight
+        self.bytes_sent += bytes_sent
+
+    def request_finished(self, latency, status=None, exception=None, bytes_received=0):
+        self.in_flight -= 1
+        self.latency.record(latency)
+        self.bytes_received += bytes_received
+        if exception is not None:
+            self.exceptions[type(exception).__name__] += 1
+        else:
+            self.statuses[status] += 1
+
+    def inc(self, name, amount=1):
+        self.counters[name] += amount
+
+    # =====================
+    # Leitura / exportação
+    # =====================
+    def snapshot(self):
+        """Gera (e guarda em last_snapshot) um resumo serializável em JSON."""
+        now = time.monotonic()
+        requests = self.latency.count
+        elapsed = now - self._last_snapshot_at
+        rate = (requests - self._last_requests) / elapsed if elapsed > 0 else 0.0
+        self._last_requests, self._last_snapshot_at = requests, now
+
+        latency = self.latency
+        snapshot = {
+            "timestamp": time.time(),
+            "uptime": time.time() - self.started_at,
+            "requests": requests,
+            "requests_per_second": rate,
+            "latency": {
+                "mean": latency.total / latency.count / 1_000_000 if latency.count else 0.0,
+                "p50": latency.percentile(50),
+                "p90": latency.percentile(90),
+                "p99": latency.percentile(99),
+                "max": latency.max / 1_000_000,
+            },
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+            "exceptions": dict(self.exceptions),
+            "counters": dict(self.counters),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+        }
+        self.last_snapshot = snapshot
+        return snapshot
+
+    def to_prometheus(self, snapshot=None):
+        """Formata as métricas no formato texto de exposição do Prometheus."""
+        snapshot = snapshot or self.snapshot()
+        lines = [
+            "# TYPE csv_poster_requests_total counter",
+            f"csv_poster_requests_total {snapshot['requests']}",
+            "# TYPE csv_poster_request_latency_seconds summary",
+        ]
+        for quantile, key in (("0.5", "p50"), ("0.9", "p90"), ("0.99", "p99")):
+            lines.append(f'csv_poster_request_latency_seconds{{quantile="{quantile}"}} {snapshot["latency"][key]}')
+        lines.append(f"csv_poster_request_latency_seconds_sum {self.latency.total / 1_000_000}")
+        lines.append(f"csv_poster_request_latency_seconds_count {self.latency.count}")
+        lines.append("# TYPE csv_poster_responses_total counter")
+        for status, count in snapshot["statuses"].items():
+            lines.append(f'csv_poster_responses_total{{status="{status}"}} {count}')
+        lines.append("# TYPE csv_poster_exceptions_total counter")
+        for name, count in snapshot["exceptions"].items():
+            lines.append(f'csv_poster_exceptions_total{{exception="{name}"}} {count}')
+        lines.append("# TYPE csv_poster_events_total counter")
+        for name, count in snapshot["counters"].items():
+            lines.append(f'csv_poster_events_total{{event="{name}"}} {count}')
+        lines += [
+            "# TYPE csv_poster_bytes_sent_total counter",
+            f"csv_poster_bytes_sent_total {snapshot['bytes_sent']}",
+            "# TYPE csv_poster_bytes_received_total counter",
+            f"csv_poster_bytes_received_total {snapshot['bytes_received']}",
+            "# TYPE csv_poster_in_flight gauge",
+            f"csv_poster_in_flight {snapshot['in_flight']}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def export_state(self):
+        """Estado completo, para consolidar métricas de vários processos."""
+        return {
+            "latency": self.latency.export_state(),
+            "statuses": dict(self.statuses),
+            "exceptions": dict(self.exceptions),
+            "counters": dict(self.counters),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "max_in_flight": self.max_in_flight,
+        }
+
+    def merge(self, state):
+        """Soma o estado exportado por outro Metrics (ex.: de um shard)."""
+        self.latency.merge(state["latency"])
+        self.statuses.update(state["statuses"])
+        self.exceptions.update(state["exceptions"])
+        self.counters.update(state["counters"])
+        self.bytes_sent += state["bytes_sent"]
+        self.bytes_received += state["bytes_received"]
+        self.max_in_flight += state["max_in_flight"]
+
+    def load(self, states):
+        """
+        Substitui os totais pela soma de vários estados exportados (ex.: o
+        mais recente de cada shard), mantendo a base do cálculo de taxa.
+        """
+        self.latency = LatencyHistogram()
+        self.statuses = Counter()
+        self.exceptions = Counter()
+        self.counters = Counter()
+        self.bytes_sent = self.bytes_received = self.max_in_flight = 0
+        for state in states:
+            self.merge(state)
+
+    def format_summary(self, snapshot=None):
+        """Resumo legível em uma linha, para log, GUI e CLI."""
+        snapshot = snapshot or self.snapshot()
+        latency = snapshot["latency"]
+        statuses = ", ".join(f"{k}: {v}" for k, v in snapshot["statuses"].items()) or "-"
+        text = (
+            f"p50 {latency['p50'] * 1000:.0f}ms | p90 {latency['p90'] * 1000:.0f}ms | "
+            f"p99 {latency['p99'] * 1000:.0f}ms | máx {latency['max'] * 1000:.0f}ms | "
+            f"em andamento {snapshot['in_flight']} | status {statuses}"
+        )
+        if snapshot["exceptions"]:
+            text += " | exceções " + ", ".join(f"{k}: {v}" for k, v in snapshot["exceptions"].items())
+        return text
+
+
+class MetricsExporter:
+    """
+    Grava periodicamente as métricas em disco: um snapshot JSON por linha
+    (append) e/ou um arquivo no formato texto do Prometheus (substituído
+    de forma atômica, compatível com o textfile collector).
+    """
+
+    def __init__(self, metrics, json_path=None, prometheus_path=None):
+        self.metrics = metrics
+        self.json_path = json_path or None
+        self.prometheus_path = prometheus_path or None
+
+    def export(self):
+        """Gera um snapshot e o grava nos destinos configurados."""
+        snapshot = self.metrics.snapshot()
+        prometheus = self.metrics.to_prometheus(snapshot) if self.prometheus_path else None
+        return snapshot, prometheus
+
+    def write(self, snapshot, prometheus):
+        """Grava em disco (pode rodar fora do event loop)."""
+        if self.json_path:
+            with open(self.json_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(snapshot) + "\n")
+        if self.prometheus_path:
+            tmp_path = self.prometheus_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(prometheus)
+            os.replace(tmp_path, self.prometheus_path)
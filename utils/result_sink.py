@@ -0,0 +1,200 @@
+# utils/result_sink.py
+import asyncio
+import csv
+import os
+import queue
+import threading
+
+from config import Settings
+from utils import json_codec
+
+
+class ResultSink:
+    """
+    Registro por linha do resultado do envio (linha, status, latência,
+    tentativas, classe do erro e campos extraídos da resposta), em CSV ou
+    JSONL conforme a extensão do arquivo, e opcionalmente um CSV com as
+    linhas que falharam, pronto para ser reenviado: `columns` é o
+    cabeçalho original do arquivo e as linhas chegam como foram lidas.
+
+    Como o ErrorSink, grava em lotes numa thread em background; aqui,
+    porém, nenhum registro é descartado: com a fila cheia, record() aguarda
+    (sem bloquear o event loop) até a thread liberar espaço.
+
+    Com append=True (retomada de um checkpoint), os arquivos existentes são
+    continuados, sem repetir o cabeçalho; linhas reenviadas na retomada
+    ganham um novo registro, e vale o mais recente.
+    """
+
+    BASE_FIELDS = ("row", "status", "latency_ms", "attempts", "error")
+
+    def __init__(self, path=None, response_fields=(), failed_path=None, columns=(), delimiter=",",
+                 batch_size=None, flush_interval=None, queue_size=None, append=False):
+        settings = Settings()
+
+        self.path = path or None
+        self.failed_path = failed_path or None
+        self.response_fields = tuple(response_fields)
+        self.columns = tuple(columns)
+        self.delimiter = delimiter
+        self.append = append
+        self.jsonl = bool(self.path) and self.path.lower().endswith((".jsonl", ".ndjson", ".json"))
+        self.batch_size = batch_size or settings.RESULTS_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.RESULTS_FLUSH_INTERVAL
+
+        self.written = 0
+        self.failed = 0
+
+        self._queue = queue.Queue(maxsize=queue_size or settings.RESULTS_QUEUE_SIZE)
+        self._thread = None
+        self._closed = False
+        self._results = None
+        self._failed = None
+        self._error = None
+
+    def __bool__(self):
+        return bool(self.path or self.failed_path)
+
+    def start(self):
+        """
+        Abre os arquivos e inicia a thread de escrita (idempotente).
+        Erros de caminho/permissão são levantados aqui, antes do envio.
+        """
+        if self._thread is not None or not self:
+            return self
+        try:
+            if self.path:
+                self._results, header = self._open(self.path)
+                if header and not self.jsonl:
+                    csv.writer(self._results).writerow(self.BASE_FIELDS + self.response_fields)
+            if self.failed_path:
+                self._failed, header = self._open(self.failed_path)
+                if header:
+                    csv.writer(self._failed, delimiter=self.delimiter).writerow(self.columns)
+        except OSError:
+            self._close_files()
+            raise
+        self._thread = threading.Thread(target=self._run, name="result-sink", daemon=True)
+        self._thread.start()
+        return self
+
+    async def record(self, row, status=None, latency=None, attempts=1, error=None, fields=None, values=None):
+        """
+        Registra o resultado final de uma linha. Se `values` for informado,
+        a linha falhou e vai também para o CSV de falhas.
+        Com a fila cheia, aguarda sem bloquear o event loop; se a thread de
+        escrita tiver falhado, levanta o erro dela.
+        """
+        if self._closed or self._thread is None:
+            return
+        latency_ms = round(latency * 1000, 1) if latency is not None else None
+        item = (row, status, latency_ms, attempts, error, fields, values)
+        self._check_writer()
+        try:
+            self._queue.put_nowait(item)
+            return
+        except queue.Full:
+            pass
+        # Fila cheia: espera numa thread, conferindo a escrita a cada intervalo
+        while True:
+            try:
+                await asyncio.to_thread(self._queue.put, item, timeout=self.flush_interval)
+                return
+            except queue.Full:
+                self._check_writer()
+
+    def _check_writer(self):
+        if self._error is not None:
+            raise RuntimeError(f"Falha ao gravar resultados: {self._error}") from self._error
+        if not self._thread.is_alive():
+            raise RuntimeError("A thread de gravação de resultados foi encerrada.")
+
+    def close(self):
+        """Grava os registros pendentes e encerra a thread de escrita."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            # Se a thread morreu, a fila pode estar cheia: não espera por ela
+            while self._thread.is_alive():
+                try:
+                    self._queue.put(None, timeout=self.flush_interval)
+                    break
+                except queue.Full:
+                    continue
+            self._thread.join()
+            self._thread = None
+        self._close_files()
+
+    def _close_files(self):
+        for f in (self._results, self._failed):
+            if f is not None:
+                f.close()
+        self._results = self._failed = None
+
+    # =====================
+    # Thread de escrita
+    # =====================
+    def _open(self, path):
+        """Abre um arquivo de saída; devolve (arquivo, se falta o cabeçalho)."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        header = not (self.append and os.path.exists(path) and os.path.getsize(path) > 0)
+        mode = "a" if self.append else "w"
+        return open(path, mode, newline="", encoding="utf-8", buffering=1024 * 1024), header
+
+    def _run(self):
+        results, failed = self._results, self._failed
+        results_writer = csv.writer(results) if results is not None and not self.jsonl else None
+        failed_writer = csv.writer(failed, delimiter=self.delimiter) if failed is not None else None
+        try:
+            stop = False
+            while not stop:
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+                batch = []
+                while item is not None:
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                else:
+                    stop = True
+
+                if results is not None:
+                    if self.jsonl:
+                        results.write("".join(self._json_line(item) for item in batch))
+                    else:
+                        results_writer.writerows(self._csv_row(item) for item in batch)
+                    results.flush()
+                    self.written += len(batch)
+                if failed is not None:
+                    rows = [item[6] for item in batch if item[6] is not None]
+                    if rows:
+                        failed_writer.writerows(rows)
+                        failed.flush()
+                        self.failed += len(rows)
+        except Exception as e:
+            # Guardado para record() reportar ao envio; a thread encerra
+            self._error = e
+        finally:
+            self._close_files()
+
+    def _csv_row(self, item):
+        row, status, latency_ms, attempts, error, fields, _ = item
+        fields = fields or {}
+        return (row, status, latency_ms, attempts, error) + tuple(fields.get(name) for name in self.response_fields)
+
+    def _json_line(self, item):
+        row, status, latency_ms, attempts, error, fields, _ = item
+        record = {"row": row, "status": status, "latency_ms": latency_ms, "attempts": attempts, "error": error}
+        if fields:
+            record.update(fields)
+        return json_codec.dumps(record).decode("utf-8") + "\n"
+